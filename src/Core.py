@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import logging
+
 import numpy as np
 from PySide6.QtCore import QObject
 from PySide6.QtCore import QThread
@@ -18,6 +20,8 @@ from src.Workers import FrameSender
 from src.Workers import FrameWorker
 from src.Workers import SampleWorker
 
+logger = logging.getLogger(__name__)
+
 
 def samples_recalc(samples: list[Sample]) -> None:
     """
@@ -110,11 +114,7 @@ class Core(QObject):  # type: ignore
         
     def delete_samples(self, index: int = None) -> None:
         """Deletes all samples or a specific sample if an index is provided."""
-        debug = False
-
-        if debug:
-            print(f"num samples = {len(self.samples)}")
-            print(f"Before: {self.samples=}")
+        logger.debug("Deleting sample %s of %d: %s", "all" if index is None else index, len(self.samples), self.samples)
 
         if index is not None:
             if 0 <= index < len(self.samples):  # Ensure index is valid
@@ -128,8 +128,7 @@ class Core(QObject):  # type: ignore
         else:
             self.samples.clear()  # Clear all samples
 
-        if debug:
-            print(f"After: {self.samples=}")
+        logger.debug("Samples after delete: %s", self.samples)
 
     def subsample_progress_update(self, subsample: Sample) -> None:
         self.OnSubsampleProgressUpdate.emit([subsample, self.subsamples])  # current sample and total
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any
 
-import matplotlib.pyplot as plt
+import matplotlib.style
 import numpy as np
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
 from PySide6.QtCore import Qt
 from PySide6.QtCore import Signal
 from PySide6.QtGui import QColor
@@ -46,7 +48,15 @@ style = {
     "savefig.facecolor": "212946",
     "image.cmap": "RdPu",
 }
-plt.style.use(style)
+matplotlib.style.use(style)
+
+
+@lru_cache(maxsize=8)
+def smooth_grid(count: int) -> np.ndarray:
+    """The x positions the smooth curve is evaluated at for samples 1..count. Shared, so read-only."""
+    grid = np.linspace(1, count, 500)
+    grid.flags.writeable = False
+    return grid
 
 
 class Graph(QWidget):  # type: ignore
@@ -57,6 +67,7 @@ class Graph(QWidget):  # type: ignore
         self.units = ""
         self.mode = ""
         self.selected_index = 0
+        self.plot_key: tuple[Any, ...] | None = None  # what the canvas currently shows
 
         # Layouts
         main_layout = QVBoxLayout()
@@ -64,12 +75,21 @@ class Graph(QWidget):  # type: ignore
         main_layout.setContentsMargins(0, 0, 0, 0)
 
         # Line chart
-        fig, self.ax = plt.subplots()
+        # A bare Figure, not pyplot, so the graph isn't held in pyplot's global figure registry
+        fig = Figure()
         self.canvas = FigureCanvas(fig)
+        self.ax = fig.add_subplot()
 
         self.ax.set_ylabel(self.units)
         self.ax.autoscale_view("tight")
 
+        # The lines are created once, updates only swap their data
+        (self.samples_line,) = self.ax.plot([], [], marker="o", markersize=5, label="Samples")
+        (self.smooth_line,) = self.ax.plot([], [], linewidth=2, label="_Smooth")  # listed once it is drawn
+        (self.slope_line,) = self.ax.plot([], [], label="Slope")
+        (self.selected_line,) = self.ax.plot([], [], linewidth=7, color="#380000", zorder=-1)
+        self.legend = self.ax.legend()  # only rebuilt when the smooth line comes or goes
+
         main_layout.addWidget(self.canvas)
 
     def set_selected_index(self, index: int) -> None:
@@ -84,78 +104,73 @@ class Graph(QWidget):  # type: ignore
         self.mode = mode
         self.update_graph()
 
+    def set_smooth_in_legend(self, shown: bool) -> None:
+        # Matplotlib leaves labels starting with an underscore out of the legend
+        label = "Smooth" if shown else "_Smooth"
+        if self.smooth_line.get_label() != label:
+            self.smooth_line.set_label(label)
+            self.legend = self.ax.legend()
+
     def update_graph(self) -> None:
-        # Clear the axis and plot the data
-        self.ax.clear()
+        # Several slots ask for a redraw after one change, skip it when the plotted values are unchanged
+        field = "y" if self.mode == "Raw" else "linYError"
+        plot_key = (self.units, self.mode, self.selected_index, tuple(getattr(s, field) for s in self.samples))
+        if plot_key == self.plot_key:
+            return
+        self.plot_key = plot_key
 
         if self.units is None or self.mode is None or len(self.samples) == 0:
-            self.canvas.draw()
+            for line in self.ax.lines:
+                line.set_data([], [])
+            self.set_smooth_in_legend(False)
+            self.canvas.draw_idle()
             return
 
         unit_multiplier = units_of_measurements[self.units]
 
+        # Raw points
         x = np.arange(1, len(self.samples) + 1)
-        y = []
+        y = np.array(plot_key[-1], dtype=float) * unit_multiplier
+        self.samples_line.set_data(x, y)
 
-        min_sample = 0.0
-        max_sample = 0.0
-        if self.mode == "Raw":
-            # Raw points
-            for s in self.samples:
-                y.append(s.y * unit_multiplier)
-            min_sample = min(y)
-            max_sample = max(y)
-            self.ax.plot(x, y, marker="o", markersize=5, label="Samples")
-
-            # Fit a smooth curve to the data points
-            if len(x) > 2:
-                f = CubicSpline(x, y, bc_type="clamped")
-                smooth_x = np.linspace(x[0], x[-1], 500)
-                smooth_y = f(smooth_x)
-                self.ax.plot(smooth_x, smooth_y, linewidth=2, label="Smooth")
-
-            # Plot line
-            line = np.polyfit(x, y, 1)
-            line = np.polyval(line, x)
-            self.ax.set_ylabel(self.units)
-            self.ax.plot(x, line, label="Slope")
+        min_sample = y.min()
+        max_sample = y.max()
 
+        # Fit a smooth curve to the data points
+        if len(x) > 2:
+            f = CubicSpline(x, y, bc_type="clamped")
+            smooth_x = smooth_grid(len(x))
+            self.smooth_line.set_data(smooth_x, f(smooth_x))
         else:
-            # Raw points
-            for s in self.samples:
-                y.append(s.linYError * unit_multiplier)
-            self.ax.plot(x, y, marker="o", markersize=5, label="Samples")
-
-            min_sample = min(y)
-            max_sample = max(y)
-
-            # Fit a smooth curve to the data points
-            if len(x) > 2:
-                f = CubicSpline(x, y, bc_type="clamped")
-                smooth_x = np.linspace(x[0], x[-1], 500)
-                smooth_y = f(smooth_x)
-                self.ax.plot(smooth_x, smooth_y, linewidth=2, label="Smooth")
-
-            # Plot line
-            self.ax.set_ylabel(self.units)
-            zeros = np.zeros(len(self.samples))
-            self.ax.plot(x, zeros, label="Slope")
+            self.smooth_line.set_data([], [])
+        self.set_smooth_in_legend(len(x) > 2)
+
+        # Plot line
+        if self.mode == "Raw":
+            line = np.polyval(np.polyfit(x, y, 1), x)
+        else:
+            line = np.zeros(len(self.samples))
+        self.slope_line.set_data(x, line)
+        self.ax.set_ylabel(self.units)
 
         # Plot selected index
         if type(self.selected_index) is int and self.selected_index >= 0:
-            x = np.array([self.selected_index, self.selected_index])
-            y = np.array([min_sample, max_sample])
-
-            self.ax.plot(x, y, linewidth=7, color="#380000", zorder=-1)
+            self.selected_line.set_data([self.selected_index, self.selected_index], [min_sample, max_sample])
             self.ax.set_alpha(0.2)
+        else:
+            self.selected_line.set_data([], [])
+
+        # The lines were only given new data, refit the view to it
+        self.ax.relim()
+        self.ax.autoscale_view()
 
         # Increase the number of ticks on the y-axis
         num_ticks = 10
-        ticks = np.linspace(min(y), max(y), num_ticks)
+        ticks = np.linspace(min_sample, max_sample, num_ticks)
         self.ax.set_yticks(ticks)
 
-        self.ax.legend()
-        self.canvas.draw()
+        # Render once the event loop is idle, so back-to-back updates share a single Agg pass
+        self.canvas.draw_idle()
 
 
 class PixmapWidget(QWidget):  # type: ignore
@@ -240,12 +255,18 @@ class TableUnit(QTableWidgetItem):  # type: ignore
         super().__init__()
         self.units = ""
         self.value = 0.0
+        self.display_key: tuple[str, float] | None = None  # (units, value) the display text was built for
+        self.display_text = ""
 
     def set_units(self, units: str) -> None:
         self.units = units
 
     def data(self, role: int) -> Any:
-        super().data(role)
         if role == Qt.DisplayRole:
-            return get_units(self.units, self.value)
+            # Only reformat when the units or value changed since the last paint
+            key = (self.units, self.value)
+            if key != self.display_key:
+                self.display_key = key
+                self.display_text = get_units(self.units, self.value)
+            return self.display_text
         return None
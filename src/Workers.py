@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import csv
+import logging
 from typing import Any
 
 import numpy as np
 import qimage2ndarray
 from PySide6.QtCore import QObject
+from PySide6.QtCore import QRunnable
 from PySide6.QtCore import Signal
 from PySide6.QtCore import Slot
 from PySide6.QtGui import QImage
@@ -16,6 +19,8 @@ from src.curves import fit_gaussian
 from src.DataClasses import FrameData
 from src.utils import get_units
 
+logger = logging.getLogger(__name__)
+
 
 class SampleWorker(QObject):  # type: ignore
     """
@@ -141,7 +146,7 @@ class FrameWorker(QObject):  # type: ignore
         try:
             histo = np.mean(qimage2ndarray.raw_view(image), axis=0)
         except ValueError as e:
-            print("Invalid QImage:", e)
+            logger.warning("Invalid QImage: %s", e)
             return
 
         pixmap = QPixmap.fromImage(image).transformed(QTransform().rotate(-90))
@@ -215,3 +220,40 @@ class FrameSender(QObject):  # type: ignore
     """
 
     OnFrameChanged = Signal(QVideoFrame)
+
+
+class CsvWriterSignals(QObject):  # type: ignore
+    """
+    Signals for CsvWriter, which as a QRunnable cannot define its own.
+
+    Attributes:
+        OnFinished (Signal): Signal emitted with the file path once all rows are written.
+        OnFailed (Signal): Signal emitted with the error message if the file could not be written.
+    """
+
+    OnFinished = Signal(str)
+    OnFailed = Signal(str)
+
+
+class CsvWriter(QRunnable):  # type: ignore
+    """
+    A runnable that writes a snapshot of table rows to a CSV file on a QThreadPool thread.
+
+    The rows are collected on the GUI thread beforehand so the worker never touches any widgets.
+    """
+
+    def __init__(self, file_path: str, rows: list[list[str]]) -> None:
+        super().__init__()
+        self.file_path = file_path
+        self.rows = rows
+        self.signals = CsvWriterSignals()
+
+    def run(self) -> None:
+        try:
+            with open(self.file_path, "w", newline="", buffering=1 << 20) as csv_file:
+                csv.writer(csv_file).writerows(self.rows)
+        except OSError as e:
+            self.signals.OnFailed.emit(str(e))
+            return
+
+        self.signals.OnFinished.emit(self.file_path)
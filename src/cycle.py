@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from typing import Any
 
+from PySide6.QtCore import QElapsedTimer
+from PySide6.QtCore import Qt
 from PySide6.QtCore import QTimer
 from PySide6.QtCore import Signal
 from PySide6.QtWidgets import QDialog
 from PySide6.QtWidgets import QFormLayout
+from PySide6.QtWidgets import QMessageBox
 from PySide6.QtWidgets import QPushButton
 from PySide6.QtWidgets import QSpinBox
 
@@ -16,11 +19,15 @@ class CyclicMeasurementSetupWindow(QDialog):  # type: ignore
     between measurements
 
     Also handles starting/stopping the timer. Parent class is expected to actually perform the
-    measurements when onMeasurementTrigger signal is emitted.
+    measurements when onMeasurementTrigger signal is emitted. Receivers should connect with
+    Qt.QueuedConnection so a slow measurement never runs inside on_timer_tick, and call
+    measurement_done once the measurement has finished. Ticks that arrive while a measurement is
+    still in flight are skipped.
     """
 
     cycle_time_sb: QSpinBox
     cycle_timer: QTimer
+    _clock: QElapsedTimer
     pb_start: QPushButton
     pb_stop: QPushButton
 
@@ -56,12 +63,26 @@ class CyclicMeasurementSetupWindow(QDialog):  # type: ignore
 
         fl.addRow(self.pb_start, self.pb_stop)
 
-        # Timer Setup
+        # Timer Setup. The timer is re-armed on every tick against an absolute deadline measured by
+        # _clock, so a late tick does not push every following tick back (no cumulative drift).
         self.cycle_timer = QTimer(self)
+        self.cycle_timer.setSingleShot(True)
+        self.cycle_timer.setTimerType(Qt.PreciseTimer)  # Coarse timers can be ~15ms late on Windows
         self.cycle_timer.timeout.connect(self.on_timer_tick)
+        self._clock = QElapsedTimer()
 
         # State Tracking
         self.elapsed_cycles = 0  # Track elapsed cycles
+        self._running = False  # True between start_cycle and stop_cycle
+        self._tick_in_flight = False  # True from a trigger until the parent calls measurement_done
+        self._interval_ms = 0  # Cycle interval committed at start
+        self._max_cycles = 0  # Number of cycles committed at start
+        self._cycle_time_s = self.cycle_time_sb.value()  # Mirrors of the spinboxes, kept by valueChanged
+        self._total_duration_s = self.total_duration_sb.value()
+
+        # Signals
+        self.cycle_time_sb.valueChanged.connect(lambda value: setattr(self, "_cycle_time_s", value))
+        self.total_duration_sb.valueChanged.connect(lambda value: setattr(self, "_total_duration_s", value))
 
         # Button Logic
         self.pb_start.released.connect(self.start_cycle)
@@ -71,26 +92,63 @@ class CyclicMeasurementSetupWindow(QDialog):  # type: ignore
         """
         Starts the cyclic measurement process based on the cycle time and total duration.
         """
-        self.elapsed_cycles = 0  # Reset counter
-        self.cycle_timer.setInterval(1000 * self.cycle_time_sb.value())  # Convert to milliseconds
-        self.cycle_timer.start()
+        cycle_time = max(1, self._cycle_time_s)
+        max_cycles = self._total_duration_s // cycle_time
+        if max_cycles == 0:
+            QMessageBox.warning(
+                self, "Invalid Duration", "The total duration must be at least as long as the cycle time."
+            )
+            return
 
+        self.elapsed_cycles = 0  # Reset counter
+        self._tick_in_flight = False
+        self._interval_ms = 1000 * cycle_time  # Convert to milliseconds
+        self._max_cycles = max_cycles
+        self._running = True
+
+        # The schedule is committed at start, so keep the spinboxes from suggesting otherwise
+        self.cycle_time_sb.setEnabled(False)
+        self.total_duration_sb.setEnabled(False)
         self.pb_start.setEnabled(False)
         self.pb_stop.setEnabled(True)
 
+        # First measurement on the next event loop iteration, the rest on cycle_time boundaries
+        self._clock.start()
+        self.cycle_timer.start(0)
+
     def on_timer_tick(self) -> None:
         """
         Handles the timer event, triggers measurement, and stops when duration is met.
         """
-        self.onMeasurementTrigger.emit()  # Emit the signal for measurement
+        if not self._running:
+            return  # Late tick delivered after stop_cycle
+
+        # Skip this cycle if the previous measurement hasn't finished, but keep counting it so the
+        # run still ends after the total duration
+        if not self._tick_in_flight:
+            self._tick_in_flight = True
+            self.onMeasurementTrigger.emit()  # Emit the signal for measurement
         self.elapsed_cycles += 1
 
-        # Calculate total allowed cycles based on duration
-        max_cycles = self.total_duration_sb.value() // self.cycle_time_sb.value()
-        if self.elapsed_cycles >= max_cycles:
+        if self.elapsed_cycles >= self._max_cycles:
             self.stop_cycle()
+            return
+
+        # Re-arm against the absolute deadline of the next cycle rather than a relative interval
+        delay = self._interval_ms * self.elapsed_cycles - self._clock.elapsed()
+        self.cycle_timer.start(max(0, delay))
+
+    def measurement_done(self) -> None:
+        """
+        Called by the parent when the measurement requested by onMeasurementTrigger has completed.
+        """
+        self._tick_in_flight = False
 
     def stop_cycle(self) -> None:
+        self._running = False
+        self._tick_in_flight = False
         self.cycle_timer.stop()
+        self.cycle_time_sb.setEnabled(True)
+        self.total_duration_sb.setEnabled(True)
         self.pb_stop.setEnabled(False)
         self.pb_start.setEnabled(True)
@@ -1,6 +1,7 @@
 #!/usr/bin/python           # This is client.py file
 from __future__ import annotations
 
+import logging
 import pickle
 import re
 import sys
@@ -27,6 +28,7 @@ from PySide6.QtWidgets import QHBoxLayout
 from PySide6.QtWidgets import QLineEdit
 from PySide6.QtWidgets import QMainWindow
 from PySide6.QtWidgets import QPushButton
+from PySide6.QtWidgets import QStackedWidget
 from PySide6.QtWidgets import QVBoxLayout
 from PySide6.QtWidgets import QWidget
 
@@ -37,6 +39,8 @@ from src.CNC_jobs.probe import ProbeJob
 
 io.templates.default = "plotly_dark"
 
+logger = logging.getLogger(__name__)
+
 
 DEV_MODE = False  # Use a bunch of dummy things such as fake linuxcnc module
 SKIP_CONNECTION = False  # Work without connecting to a socket
@@ -88,7 +92,8 @@ class MainWindow(QMainWindow):  # type: ignore
         self.job_type_combo = QComboBox()
 
         self.jobs_types = {}
-        self.job = ProbeJob()
+        self.job_pages: dict[str, QWidget] = {}  # job widgets built so far, one stack page each
+        self.job_stack = QStackedWidget()
 
         self.data = np.zeros((5, 5), dtype=np.float64)
 
@@ -113,7 +118,7 @@ class MainWindow(QMainWindow):  # type: ignore
 
         self.left_layout.addLayout(form)
 
-        self.left_layout.addWidget(self.job)
+        self.left_layout.addWidget(self.job_stack)
         self.left_layout.addStretch()
         self.left_layout.addLayout(btn_layout)
 
@@ -121,6 +126,12 @@ class MainWindow(QMainWindow):  # type: ignore
         main_layout.addWidget(self.plot_widget)
 
         # Logic
+        # The job buttons always drive whichever job page is current
+        self.connect_btn.clicked.connect(
+            lambda: self.job.driver.connect_to_host(self.ip_line.text(), self.port_line.text())
+        )
+        self.stop_btn.clicked.connect(lambda: self.job.driver.stop())
+        self.start_btn.clicked.connect(lambda: self.job.start_driver())
         self.start_btn.clicked.connect(self.start_btn_update_GUI)
         self.job_type_combo.currentIndexChanged.connect(self.job_changed)
         self.update_btn.clicked.connect(self.update_graph)
@@ -152,7 +163,7 @@ class MainWindow(QMainWindow):  # type: ignore
             with open(file_path, "wb") as file:
                 pickle.dump(self.data, file)
 
-            print(f"NumPy array saved to {file_path}")
+            logger.info("NumPy array saved to %s", file_path)
 
     def load_np(self) -> None:
         options = QFileDialog.Options()
@@ -169,9 +180,9 @@ class MainWindow(QMainWindow):  # type: ignore
                 # Update the stored data with the loaded array
                 self.data = loaded_array
 
-                print(f"NumPy array loaded from {file_path}: {self.data}")
+                logger.debug("NumPy array loaded from %s: %s", file_path, self.data)
             except Exception as e:
-                print(f"Error loading NumPy array: {e}")
+                logger.error("Error loading NumPy array: %s", e)
 
         self.update_graph()
 
@@ -188,34 +199,29 @@ class MainWindow(QMainWindow):  # type: ignore
                     file_path, self.data, delimiter=",", fmt="%.6f"
                 )  # fmt = 6 decimal places. Change if you need more
 
-                print(f"NumPy array exported to {file_path} in CSV format.")
+                logger.info("NumPy array exported to %s in CSV format.", file_path)
             except Exception as e:
-                print(f"Error exporting NumPy array to CSV: {e}")
+                logger.error("Error exporting NumPy array to CSV: %s", e)
 
     def job_changed(self) -> None:
         job_name = str(self.job_type_combo.currentText())
-        old_widget = self.job
-        new_widget = self.jobs_types[job_name]()
-        self.left_layout.replaceWidget(old_widget, new_widget)
-        self.job = new_widget
-        old_widget.deleteLater()
-
-        # Hook up the new connections
-        self.connect_btn.clicked.connect(
-            lambda ip=self.ip_line.text(), port=self.port_line.text(): self.job.driver.connect_to_host(ip, port)
-        )
-        self.job.driver.connection_made.connect(self.connect_update_GUI)
-        self.stop_btn.clicked.connect(self.job.driver.stop)
-        self.job.data_changed.connect(self.update_data)
-        self.start_btn.clicked.connect(self.job.start_driver)
-        self.job.driver.job_stopped.connect(self.stop_update_GUI)
+        job = self.job_pages.get(job_name)
+        if job is None:
+            # Build each job once and hook up its connections, switching back just flips the page
+            job = self.job_pages[job_name] = self.jobs_types[job_name]()
+            job.driver.connection_made.connect(self.connect_update_GUI)
+            job.data_changed.connect(self.update_data)
+            job.driver.job_stopped.connect(self.stop_update_GUI)
+            self.job_stack.addWidget(job)
+        self.job_stack.setCurrentWidget(job)
+        self.job = job
 
     def update_data(self, data: Dict[str, Any]) -> None:
-        print("updating data:", data)
+        logger.debug("updating data: %s", data)
         self.data = data
 
     def connect_update_GUI(self) -> None:
-        print("updating the GUI that a connection was made")
+        logger.debug("updating the GUI that a connection was made")
         self.connect_btn.setDisabled(True)
         self.start_btn.setEnabled(True)
 
@@ -229,7 +235,7 @@ class MainWindow(QMainWindow):  # type: ignore
         self.update_graph()
 
     def closeEvent(self, event: QCloseEvent) -> None:
-        print("in close event")
+        logger.debug("in close event")
         self.settings = QSettings("linuxcnc_remote_driver", "LinuxCNCRemoteDriver")
         self.settings.setValue("geometry", self.saveGeometry())
         self.settings.setValue("ip", self.ip_line.text())
@@ -238,8 +244,7 @@ class MainWindow(QMainWindow):  # type: ignore
         QWidget.closeEvent(self, event)
 
     def update_graph(self) -> None:
-        print("Updating Graph")
-        print(self.data)
+        logger.debug("Updating Graph: %s", self.data)
         graph = go.Surface(z=self.data)
         fig = go.Figure(
             data=[graph],
@@ -270,6 +275,7 @@ class MainWindow(QMainWindow):  # type: ignore
 
 
 def start() -> None:
+    logging.basicConfig(level=logging.WARNING)
     app = QApplication(sys.argv)
     qdarktheme.setup_theme(additional_qss="QToolTip {color: black;}")
 
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
-import csv
+import logging
 import shutil
 import subprocess
 import sys
 import os
-import re
+import time
+from typing import Any
 
 
+import numpy as np
 import qdarktheme
 
 from PySide6.QtCore import QSettings
+from PySide6.QtCore import QThreadPool
+from PySide6.QtCore import QTimer
 from PySide6.QtCore import Qt
 from PySide6.QtCore import QUrl
 from PySide6.QtGui import QAction
@@ -49,11 +53,46 @@ from src.Widgets import AnalyserWidget
 from src.Widgets import Graph
 from src.Widgets import PixmapWidget
 from src.Widgets import TableUnit
+from src.Workers import CsvWriter
 from src.surface_mapping_ui import SurfaceMappingDialog
 
+logger = logging.getLogger(__name__)
+
+_MU_TABLE = str.maketrans({"\u03bc": "u"})  # CSV exports spell micro as a plain "u"
+
+# Sample table header labels for every selectable unit
+_HEADERS_BY_UNIT = {
+    units: (f"Measured ({units})", f"Flattened ({units})", f"Below Max ({units})", f"Above Min ({units})")
+    for units in units_of_measurements
+}
+
+_SETTINGS: QSettings | None = None
+
+
+def app_settings() -> QSettings:
+    """Returns the application's QSettings store, created on first use and shared afterwards."""
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = QSettings("laser-level-webcam", "LaserLevelWebcam")
+    return _SETTINGS
+
+
+def _settings_text(value: Any) -> Any:
+    """Normalizes a settings value to the text form the INI backend reads back, so values compare equal."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [_settings_text(item) for item in value]
+    return value
+
+
 # Define the main window
 class MainWindow(QMainWindow):  # type: ignore
-    cycle_dialog: CyclicMeasurementSetupWindow
+    cycle_dialog: CyclicMeasurementSetupWindow | None
+    socket_dialog: SocketWindow | None
+    surface_mapping_panel: SurfaceMappingDialog | None
 
     def __init__(self) -> None:
         super().__init__()
@@ -71,8 +110,7 @@ class MainWindow(QMainWindow):  # type: ignore
         # create "File->Cyclic measurement" action
         cycle_action = QAction("Cyclic measurement", self)
         cycle_action.triggered.connect(self.cycle_measurement_action)
-        self.cycle_dialog = CyclicMeasurementSetupWindow(self)
-        self.cycle_dialog.onMeasurementTrigger.connect(self.on_cyclic_measurement)
+        self.cycle_dialog = None  # built on first use by cycle_measurement_action
         file_menu.addAction(cycle_action)
 
         # Create a new menu option
@@ -83,7 +121,9 @@ class MainWindow(QMainWindow):  # type: ignore
         # websocket server action
         websocket_action = QAction("Socket Server", self)
         websocket_action.triggered.connect(self.socket_server_action)
-        self.socket_dialog = SocketWindow(self)
+        self.socket_dialog = None  # built on first use by socket_server_action
+        self.socket_ip_address = ""  # kept here until the socket dialog exists
+        self.socket_port = ""
         file_menu.addAction(websocket_action)
 
         # create a QAction for the "Exit" option
@@ -104,6 +144,16 @@ class MainWindow(QMainWindow):  # type: ignore
         self.setting_zero = False  # state if the GUI is setting zero
         self.replace_sample = False  # state if we are replcing a sample
         self.table_selected_index = 0  # we keep track of the index so we can reselect it
+        self.table_units = None  # units the sample table headers were last built for
+        self.highlighted_index = None  # sample index last pushed to the graph
+        self.progress_painted_at = 0.0  # time.monotonic() of the last subsample progress update
+        self.cell_pool: list[TableUnit] = []  # detached sample table cells kept for reuse
+
+        # Coalesces bursts of table selection changes into a single graph update
+        self.highlight_timer = QTimer(self)
+        self.highlight_timer.setSingleShot(True)
+        self.highlight_timer.setInterval(30)
+        self.highlight_timer.timeout.connect(self.push_highlighted_sample)
 
         self.core = Core()  # where all the magic happens
 
@@ -122,8 +172,10 @@ class MainWindow(QMainWindow):  # type: ignore
         self.left_splitter = QSplitter()
         self.middle_splitter = QSplitter()
         self.right_splitter = QSplitter(Qt.Orientation.Vertical)
-        
-        self.setup_surface_mapping_panel()  # ✅ Add this line to initialize the panel
+
+        self.surface_mapping_panel = None  # built on first use by open_surface_mapping
+        self.surface_mapping_width = 0  # saved width of the panel, applied when it is built
+        self.surface_mapping_ui = None
         
         surface_map_widget = QGroupBox("Surface Map")
 
@@ -196,6 +248,8 @@ class MainWindow(QMainWindow):  # type: ignore
         self.sample_table.setToolTip(tt["table"])
         self.sample_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.sample_table.setSelectionMode(QAbstractItemView.SingleSelection)  # limit selection to a single row
+        self.sample_table.setColumnCount(4)  # Measured, Flattened, Below Max, Above Min
+        self.sample_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         sample_layout = QGridLayout()
         sample_layout.setContentsMargins(1, 1, 1, 1)
         sample_layout.addWidget(QLabel("Sub Samples #"), 0, 0, 1, 1, alignment=Qt.AlignRight)
@@ -259,12 +313,11 @@ class MainWindow(QMainWindow):  # type: ignore
         self.sensor_feed_widget.OnHeightChanged.connect(
             lambda value: setattr(self.core.frameWorker, "analyser_widget_height", value)
         )
-        self.smoothing.valueChanged.connect(lambda value: setattr(self.core.frameWorker, "analyser_smoothing", value))
         self.smoothing.valueChanged.connect(self.smoothing_value)
-        self.subsamples_spin.valueChanged.connect(lambda value: setattr(self.core, "subsamples", value))
-        self.outlier_spin.valueChanged.connect(lambda value: setattr(self.core, "outliers", value))
+        self.subsamples_spin.valueChanged.connect(self.subsamples_value)
+        self.outlier_spin.valueChanged.connect(self.outlier_value)
         self.units_combo.currentTextChanged.connect(self.core.set_units)
-        self.sensor_width_spin.valueChanged.connect(lambda value: setattr(self.core, "sensor_width", value))
+        self.sensor_width_spin.valueChanged.connect(self.sensor_width_value)
         self.zero_btn.clicked.connect(self.zero_btn_cmd)
         self.sample_btn.clicked.connect(self.sample_btn_cmd)
         self.replace_btn.clicked.connect(self.replace_btn_cmd)
@@ -274,7 +327,7 @@ class MainWindow(QMainWindow):  # type: ignore
         self.core.OnSubsampleProgressUpdate.connect(self.subsample_progress_update)
         self.core.OnSampleComplete.connect(self.finished_subsample)
         self.core.OnSampleComplete.connect(self.update_table)
-        self.core.OnUnitsChanged.connect(self.update_table)
+        self.core.OnUnitsChanged.connect(self.update_table_units)
         self.core.OnUnitsChanged.connect(self.graph.set_units)
         camera_device_settings_btn.clicked.connect(self.extra_controls)
         self.camera_combo.currentIndexChanged.connect(self.core.set_camera)
@@ -285,7 +338,17 @@ class MainWindow(QMainWindow):  # type: ignore
         self.core.frameWorker.OnPixmapChanged.connect(self.sensor_feed_widget.setPixmap)
         self.core.frameWorker.OnCentreChanged.connect(self.core.sample_worker.sample_in)
 
-        # Trigger the state of things
+        # Set defaults and restore saved settings with signals blocked, then push the final state once
+        restored_widgets = (
+            self.smoothing,
+            self.subsamples_spin,
+            self.outlier_spin,
+            self.units_combo,
+            self.sensor_width_spin,
+        )
+        for widget in restored_widgets:
+            widget.blockSignals(True)
+
         self.smoothing.setValue(50)
         self.subsamples_spin.setValue(10)
         self.outlier_spin.setValue(30)
@@ -293,37 +356,53 @@ class MainWindow(QMainWindow):  # type: ignore
         self.sensor_width_spin.setValue(5.9)
         self.raw_radio.setChecked(True)
 
-        settings = QSettings("laser-level-webcam", "LaserLevelWebcam")
-
-        if settings.contains("geometry"):
-            self.restoreGeometry(settings.value("geometry"))
-        if settings.contains("sensor_width"):
-            self.sensor_width_spin.setValue(float(settings.value("sensor_width")))
-        if settings.contains("smoothing"):
-            self.smoothing.setValue(int(settings.value("smoothing")))
-        if settings.contains("subsamples"):
-            self.subsamples_spin.setValue(int(settings.value("subsamples")))
-        if settings.contains("outlier"):
-            self.outlier_spin.setValue(int(settings.value("outlier")))
-        if settings.contains("units"):
-            self.units_combo.setCurrentIndex(int(settings.value("units")))
-        if settings.contains("raw"):
-            if settings.value("raw") == "true":
+        settings = app_settings()
+        saved = {key: settings.value(key) for key in settings.allKeys()}  # read the store once
+
+        if "geometry" in saved:
+            self.restoreGeometry(saved["geometry"])
+        if "sensor_width" in saved:
+            self.sensor_width_spin.setValue(float(saved["sensor_width"]))
+        if "smoothing" in saved:
+            self.smoothing.setValue(int(saved["smoothing"]))
+        if "subsamples" in saved:
+            self.subsamples_spin.setValue(int(saved["subsamples"]))
+        if "outlier" in saved:
+            self.outlier_spin.setValue(int(saved["outlier"]))
+        if "units" in saved:
+            self.units_combo.setCurrentIndex(int(saved["units"]))
+        if "raw" in saved:
+            if saved["raw"] == "true":
                 self.raw_radio.setChecked(True)
             else:
                 self.flat_radio.setChecked(True)
 
-        if settings.contains("left_splitter"):
-            self.left_splitter.setSizes([int(i) for i in settings.value("left_splitter")])
-        if settings.contains("middle_splitter"):
-            self.middle_splitter.setSizes([int(i) for i in settings.value("middle_splitter")])
-        if settings.contains("right_splitter"):
-            self.right_splitter.setSizes([int(i) for i in settings.value("right_splitter")])
-
-        if settings.contains("ip_address"):
-            self.socket_dialog.ip_line.setText(settings.value("ip_address"))
-        if settings.contains("port"):
-            self.socket_dialog.port_line.setText(settings.value("port"))
+        if "left_splitter" in saved:
+            left_sizes = [int(i) for i in saved["left_splitter"]]
+            # Older settings stored the surface mapping panel's width first, it now has its own key
+            if len(left_sizes) > 2:
+                self.surface_mapping_width = left_sizes[0]
+            self.left_splitter.setSizes(left_sizes[-2:])
+        if "surface_mapping_width" in saved:
+            self.surface_mapping_width = int(saved["surface_mapping_width"])
+        if "middle_splitter" in saved:
+            self.middle_splitter.setSizes([int(i) for i in saved["middle_splitter"]])
+        if "right_splitter" in saved:
+            self.right_splitter.setSizes([int(i) for i in saved["right_splitter"]])
+
+        if "ip_address" in saved:
+            self.socket_ip_address = saved["ip_address"]
+        if "port" in saved:
+            self.socket_port = saved["port"]
+
+        for widget in restored_widgets:
+            widget.blockSignals(False)
+
+        self.core.frameWorker.analyser_smoothing = self.smoothing.value()
+        self.subsamples_value(self.subsamples_spin.value())
+        self.outlier_value(self.outlier_spin.value())
+        self.sensor_width_value(self.sensor_width_spin.value())
+        self.core.set_units(self.units_combo.currentText())
 
         self.update_graph_mode()  # have to trigger it manually the first time
 
@@ -334,12 +413,25 @@ class MainWindow(QMainWindow):  # type: ignore
         Adds the Surface Mapping Panel to the left-hand side of the MainWindow.
         """
         self.surface_mapping_panel = SurfaceMappingDialog(self)
+        self.surface_mapping_ui = self.surface_mapping_panel  # the menu action shows this same panel
     # ✅ Ensure the panel appears on the left by adding it to `left_splitter`
         self.left_splitter.insertWidget(0, self.surface_mapping_panel)
+        if self.surface_mapping_width:
+            self.left_splitter.setSizes([self.surface_mapping_width] + self.left_splitter.sizes()[1:])
 
-    def smoothing_value(self, val: float) -> None:
+    def smoothing_value(self, val: int) -> None:
+        self.core.frameWorker.analyser_smoothing = val
         self.status_bar.showMessage(f"Smoothing: {val}", 1000)  # 3 seconds
 
+    def subsamples_value(self, val: int) -> None:
+        self.core.subsamples = val
+
+    def outlier_value(self, val: int) -> None:
+        self.core.outliers = val
+
+    def sensor_width_value(self, val: float) -> None:
+        self.core.sensor_width = val
+
     def openSourceCode(self) -> None:
         url = "https://github.com/bhowiebkr/laser-level-webcam"
         QDesktopServices.openUrl(QUrl(url))
@@ -350,32 +442,40 @@ class MainWindow(QMainWindow):  # type: ignore
         if not file_path:
             return
 
-        # open the file and write the data from the QTableWidget to it as CSV
-        with open(file_path, "w", newline="") as csv_file:
-            writer = csv.writer(csv_file)
-            for row in range(self.sample_table.rowCount()):
-                row_data = []
-                for column in range(self.sample_table.columnCount()):
-                    item = self.sample_table.item(row, column)
-                    if item is not None:
-                        row_data.append(item.text().replace("\u03bc", "u"))
-                    else:
-                        row_data.append("")
-                writer.writerow(row_data)
+        table = self.sample_table
+        item = table.item
+        row_count = table.rowCount()
+        column_count = table.columnCount()
+
+        def cell_text(row: int, column: int) -> str:
+            cell = item(row, column)
+            return "" if cell is None else cell.text().translate(_MU_TABLE)
+
+        # Snapshot the table here, the file itself is written on a pool thread
+        rows = [[cell_text(row, column) for column in range(column_count)] for row in range(row_count)]
+
+        self.csv_writer = CsvWriter(file_path, rows)
+        self.csv_writer.signals.OnFinished.connect(lambda path: self.status_bar.showMessage(f"Exported {path}", 3000))
+        self.csv_writer.signals.OnFailed.connect(lambda error: QMessageBox.critical(self, "Export Failed", error))
+        QThreadPool.globalInstance().start(self.csv_writer)
 
     def socket_server_action(self) -> None:
-        """Show the dialog for the websocket server"""
-        self.socket_dialog.message_received.connect(self.socket_dialog.update_text_edit)
-        self.socket_dialog.take_sample.connect(self.sample_btn_cmd)
-        self.socket_dialog.zero.connect(self.zero_btn_cmd)
-        self.core.OnSampleComplete.connect(self.socket_server_sample_complete)
+        """Show the dialog for the websocket server, building it on first use"""
+        if self.socket_dialog is None:
+            self.socket_dialog = SocketWindow(self)
+            self.socket_dialog.ip_line.setText(self.socket_ip_address)
+            self.socket_dialog.port_line.setText(self.socket_port)
+            self.socket_dialog.message_received.connect(self.socket_dialog.update_text_edit)
+            self.socket_dialog.take_sample.connect(self.sample_btn_cmd)
+            self.socket_dialog.zero.connect(self.zero_btn_cmd)
+            self.core.OnSampleComplete.connect(self.socket_server_sample_complete)
 
         self.socket_dialog.show()
 
     def open_surface_mapping(self):
-        """Opens the Surface Mapping UI and ensures it is initialized."""
-        if not hasattr(self, "surface_mapping_ui") or self.surface_mapping_ui is None:
-            self.surface_mapping_ui = SurfaceMappingDialog(self)  # ✅ Create the instance
+        """Shows the Surface Mapping panel, building it on first use."""
+        if self.surface_mapping_panel is None:
+            self.setup_surface_mapping_panel()
 
         self.surface_mapping_ui.show()  # ✅ Show the dialog
 
@@ -389,7 +489,12 @@ class MainWindow(QMainWindow):  # type: ignore
             self.socket_dialog.send_message(f"SAMPLE {sample_val}")
 
     def cycle_measurement_action(self) -> None:
-        """Displays the cyclic measurement dialog"""
+        """Displays the cyclic measurement dialog, building it on first use"""
+        if self.cycle_dialog is None:
+            self.cycle_dialog = CyclicMeasurementSetupWindow(self)
+            self.cycle_dialog.onMeasurementTrigger.connect(self.on_cyclic_measurement, Qt.QueuedConnection)
+            self.core.OnSampleComplete.connect(self.cycle_dialog.measurement_done)
+
         self.cycle_dialog.show()
 
     def on_cyclic_measurement(self) -> None:
@@ -400,7 +505,15 @@ class MainWindow(QMainWindow):  # type: ignore
             self.zero_btn.click()
 
     def hightlight_sample(self) -> None:
+        if not self.highlight_timer.isActive():
+            self.highlight_timer.start()
+
+    def push_highlighted_sample(self) -> None:
         index = self.sample_table.currentRow()
+        if index == self.highlighted_index:
+            return
+
+        self.highlighted_index = index
         self.graph.set_selected_index(index)
 
     def extra_controls(self) -> None:
@@ -409,7 +522,7 @@ class MainWindow(QMainWindow):  # type: ignore
             cmd = f'ffmpeg -f dshow -show_video_device_dialog true -i video="{self.camera_combo.currentText()}"'
             subprocess.Popen(cmd, shell=True)
         else:
-            print("missing!")
+            logger.warning("ffmpeg is missing")
             msg = QMessageBox()
             msg.setWindowTitle("Missing FFMPEG")
             msg_str = "FFMPEG is not installed or is not found in the Windows path. "
@@ -425,62 +538,92 @@ class MainWindow(QMainWindow):  # type: ignore
         """Ensures that data is always appended to the latest existing file."""
 
         file_base, file_ext = os.path.splitext(base_filename)
+        base_name = os.path.basename(base_filename)
+        name_base = os.path.splitext(base_name)[0]
+
+        # ✅ List the directory once instead of checking each candidate version on disk
+        try:
+            with os.scandir(os.path.dirname(base_filename) or ".") as entries:
+                existing = {entry.name for entry in entries}
+        except FileNotFoundError:
+            return base_filename
 
         # ✅ Check if the base file exists and use it
-        if os.path.exists(base_filename):
+        if base_name in existing:
             return base_filename
 
         # ✅ If no base file, check for the latest version
         version = 1
         latest_file = base_filename  # Default to base filename if no versions exist
 
-        while os.path.exists(f"{file_base}_v{version}{file_ext}"):
+        while f"{name_base}_v{version}{file_ext}" in existing:
             latest_file = f"{file_base}_v{version}{file_ext}"
             version += 1
 
         # ✅ Return the latest existing file (or base file if no versions exist)
         return latest_file
 
-    def update_table(self) -> None:
+    def update_table_units(self, units: str) -> None:
+        """
+        Refreshes the table for new units. The graph redraws itself through its own set_units slot.
+        """
+        self.update_table(update_graph=False)
+
+    def update_table(self, update_graph: bool = True) -> None:
         """
         Updates the QTableWidget with the latest measurement data.
         This function no longer writes to external files.
         """
         units = self.core.units
-        header_names = [
-            f"Measured ({units})",
-            f"Flattened ({units})",
-            f"Below Max ({units})",
-            f"Above Min ({units})",
-        ]
-
-        self.sample_table.setColumnCount(len(header_names))
-        self.sample_table.setHorizontalHeaderLabels(header_names)
-        header = self.sample_table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.Stretch)
-
-        # Clear the table UI
-        self.sample_table.setRowCount(0)
-
-        for sample in self.core.samples:
-            row_index = self.sample_table.rowCount()
-            self.sample_table.insertRow(row_index)
-
-            row_data = [sample.y, sample.linYError, sample.shim, sample.scrape]
-            
-            for col, val in enumerate(row_data):
-                cell = TableUnit()
-                cell.value = val
-                cell.units = self.core.units
-                self.sample_table.setItem(row_index, col, cell)
+        samples = self.core.samples
+        table = self.sample_table
+
+        if units != self.table_units:
+            table.setHorizontalHeaderLabels(_HEADERS_BY_UNIT[units])
+            self.table_units = units
+
+        sorting_enabled = table.isSortingEnabled()
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        table.setSortingEnabled(False)
+        try:
+            item = table.item
+            set_item = table.setItem
+            cell_pool = self.cell_pool
+            column_count = table.columnCount()
+
+            # Keep the cells of dropped rows so they can be reused when the table grows again
+            for row in range(len(samples), table.rowCount()):
+                for col in range(column_count):
+                    cell = table.takeItem(row, col)
+                    if cell is not None:
+                        cell_pool.append(cell)
+
+            # Resize once, existing cells are updated in place
+            table.setRowCount(len(samples))
+
+            for row, sample in enumerate(samples):
+                for col, val in enumerate((sample.y, sample.linYError, sample.shim, sample.scrape)):
+                    cell = item(row, col)
+                    if cell is None:
+                        cell = cell_pool.pop() if cell_pool else TableUnit()
+                        set_item(row, col, cell)
+                    cell.value = val
+                    cell.units = units
+        finally:
+            table.setSortingEnabled(sorting_enabled)
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
+        table.viewport().update()  # cells mutated in place don't notify the view
 
         # Maintain UI selection
         if self.sample_table.rowCount() and not self.sample_table.selectedIndexes():
             self.sample_table.selectRow(0)
 
         self.sample_table.selectRow(self.table_selected_index)
-        self.graph.update_graph()
-        print("Table updated successfully.")
+        if update_graph:
+            self.graph.update_graph()
+        logger.debug("Table updated successfully.")
 
     def reset_sample_table(self):
         """Clears all entries in the sample table."""
@@ -491,7 +634,7 @@ class MainWindow(QMainWindow):  # type: ignore
 
         if confirm == QMessageBox.Yes:
             self.sample_table.setRowCount(0)  # ✅ Clears all rows
-            print("[DEBUG] Sample Table Reset: All entries cleared.")
+            logger.debug("Sample Table Reset: All entries cleared.")
 
 
 
@@ -499,58 +642,36 @@ class MainWindow(QMainWindow):  # type: ignore
         """
         Compute the average, min, and max measurement from the sample table.
         """
-        print("[DEBUG] compute_overall_measurement() called!")
-
-        values = []
-        pattern = re.compile(r"[-+]?\d*\.?\d+")  # Extract numeric values
-
-        for row in range(self.sample_table.rowCount()):
-            item = self.sample_table.item(row, 1)  # First column (Flattened Value)
-            if item:
-                text_value = item.text().strip()  
-                match = pattern.search(text_value)  
-
-                if match:
-                    try:
-                        numeric_value = float(match.group())  
-                        values.append(numeric_value)
-                        print(f"[DEBUG] Extracted {numeric_value} from '{text_value}'")  
-                    except ValueError:
-                        print(f"[WARNING] Could not convert '{text_value}' to a number.")  
-                else:
-                    print(f"[WARNING] No numeric data found in '{text_value}'")  
-
-        if values:
-            avg_value = sum(values) / len(values)
-            min_value = min(values)
-            max_value = max(values)
-            count = len(values)
+        # Read the flattened values straight from the samples the table shows, in one pass
+        samples = self.core.samples[: self.sample_table.rowCount()]
+        values = np.fromiter((sample.linYError for sample in samples), dtype=float, count=len(samples))
+        values *= units_of_measurements[self.core.units]
+
+        count = len(values)
+        if count:
+            avg_value = float(values.mean())
+            min_value = float(values.min())
+            max_value = float(values.max())
         else:
             avg_value = None
             min_value = None
             max_value = None
-            count = 0
 
-        print(f"[DEBUG] Computed Measurement - Avg: {avg_value}, Min: {min_value}, Max: {max_value}, Count: {count}")
+        logger.debug(
+            "Computed Measurement - Avg: %s, Min: %s, Max: %s, Count: %s", avg_value, min_value, max_value, count
+        )
         return avg_value, min_value, max_value, count  # ✅ Return all values as a tuple
 
     
     def export_measurement_to_mapping(self):
         """Sends computed average measurement to Surface Mapping UI."""
-        
-        # 🔥 Debug: Ensure this function is running
-        print("🔥 export_measurement_to_mapping() is being called!")
-        avg_value, min_value, max_value = self.compute_overall_measurement()
-        
-        # 🔥 Debug: Print computed values
-        print(f"✅ Computed Values -> Avg: {avg_value}, Min: {min_value}, Max: {max_value}")
-        
+        avg_value, min_value, max_value, count = self.compute_overall_measurement()
 
         # ✅ Ensure Surface Mapping UI is open before sending data
         if hasattr(self, "surface_mapping_ui") and self.surface_mapping_ui:
-            self.surface_mapping_ui.handle_measurement_import(avg_value)
+            self.surface_mapping_ui.handle_measurement_import(avg_value, min_value, max_value, count)
         else:
-                print("❌ Error: Surface Mapping UI is not open!")
+                logger.warning("Surface Mapping UI is not open!")
                 QMessageBox.warning(self, "Error", "Surface Mapping UI is not open.")
 
 
@@ -582,6 +703,12 @@ class MainWindow(QMainWindow):  # type: ignore
         sample = sample_total[0]
         total = sample_total[1]
 
+        # Subsamples arrive at frame rate, repaint the button at most every 50ms but always show the last one
+        now = time.monotonic()
+        if sample != total and now - self.progress_painted_at < 0.05:
+            return
+        self.progress_painted_at = now
+
         if self.setting_zero is True:
             self.zero_btn.setText(f"{sample}/{total}")
         else:
@@ -661,37 +788,55 @@ class MainWindow(QMainWindow):  # type: ignore
             self.update_table()  # Refresh UI
             
     def closeEvent(self, event: QCloseEvent) -> None:
-        print("In close event")
-        self.settings = QSettings("laser-level-webcam", "LaserLevelWebcam")
-        self.settings.setValue("geometry", self.saveGeometry())
-        self.settings.setValue("sensor_width", self.sensor_width_spin.value())
-        self.settings.setValue("smoothing", self.smoothing.value())
-        self.settings.setValue("subsamples", self.subsamples_spin.value())
-        self.settings.setValue("outlier", self.outlier_spin.value())
-        self.settings.setValue("units", self.units_combo.currentIndex())
-        self.settings.setValue("raw", self.raw_radio.isChecked())
+        logger.debug("In close event")
+        if self.socket_dialog is not None:
+            self.socket_ip_address = self.socket_dialog.ip_line.text()
+            self.socket_port = self.socket_dialog.port_line.text()
+
+        if self.surface_mapping_panel is not None:
+            self.surface_mapping_panel.stop_file_writer()
+
+        # The surface mapping panel is only in the splitter once it was opened, its width is kept separately
+        left_sizes = self.left_splitter.sizes()
+        if self.surface_mapping_panel is not None and self.surface_mapping_panel.isVisible():
+            self.surface_mapping_width = left_sizes[0]
+
+        # Only queue values that changed since they were stored, and write the INI file once
+        settings = app_settings()
+        changed = False
+        for key, value in (
+            ("geometry", self.saveGeometry()),
+            ("sensor_width", self.sensor_width_spin.value()),
+            ("smoothing", self.smoothing.value()),
+            ("subsamples", self.subsamples_spin.value()),
+            ("outlier", self.outlier_spin.value()),
+            ("units", self.units_combo.currentIndex()),
+            ("raw", self.raw_radio.isChecked()),
+            ("left_splitter", left_sizes[-2:]),
+            ("surface_mapping_width", self.surface_mapping_width),
+            ("middle_splitter", self.middle_splitter.sizes()),
+            ("right_splitter", self.right_splitter.sizes()),
+            ("ip_address", self.socket_ip_address),
+            ("port", self.socket_port),
+        ):
+            if _settings_text(settings.value(key)) != _settings_text(value):
+                settings.setValue(key, value)
+                changed = True
+        if changed:
+            settings.sync()
+
         """Ensure all QThreads are safely closed before exiting."""
         self.core.workerThread.quit()
         self.core.workerThread.wait()
         self.core.sampleWorkerThread.quit()
         self.core.sampleWorkerThread.wait()
         event.accept()
-        self.settings.setValue("left_splitter", self.left_splitter.sizes())
-        self.settings.setValue("middle_splitter", self.middle_splitter.sizes())
-        self.settings.setValue("right_splitter", self.right_splitter.sizes())
-
-        self.settings.setValue("ip_address", self.socket_dialog.ip_line.text())
-        self.settings.setValue("port", self.socket_dialog.port_line.text())
-
-        self.core.workerThread.quit()
-        self.core.workerThread.wait()
-        self.core.sampleWorkerThread.quit()
-        self.core.sampleWorkerThread.wait()
         self.deleteLater()
         super().closeEvent(event)
 
 
 def start() -> None:
+    logging.basicConfig(level=logging.WARNING)
     app = QApplication(sys.argv)
     qdarktheme.load_stylesheet("dark")
     
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 import socket
 
 from PySide6.QtCore import Signal
@@ -16,6 +17,8 @@ from PySide6.QtWidgets import QPushButton
 from PySide6.QtWidgets import QTextEdit
 from PySide6.QtWidgets import QVBoxLayout
 
+logger = logging.getLogger(__name__)
+
 
 class SocketWindow(QDialog):  # type: ignore
     message_received = Signal(str)
@@ -79,7 +82,7 @@ class SocketWindow(QDialog):  # type: ignore
         self.client_connection.readyRead.connect(self.receive_message)
 
     def start_server(self) -> None:
-        print("Start server")
+        logger.debug("Start server")
         ip = str(self.ip_line.text())
         port = int(self.port_line.text())
         self.server.listen(QHostAddress(ip), port)
@@ -88,7 +91,7 @@ class SocketWindow(QDialog):  # type: ignore
 
     def receive_message(self) -> None:
         message = self.client_connection.readAll().data().decode()
-        print(f"server recieved message: {message}")
+        logger.debug("server recieved message: %s", message)
         if message == "TAKE_SAMPLE\n":
             self.take_sample.emit()
         elif message == "ZERO\n":
@@ -100,11 +103,11 @@ class SocketWindow(QDialog):  # type: ignore
 
     def send_message(self, message: str) -> None:
         if message:
-            print(f"sending message to the client {message}")
+            logger.debug("sending message to the client %s", message)
             self.client_connection.write(f"{message}".encode())
             self.update_text_edit(f"Replying: {message}")
         else:
-            print(f"message is empty: {[message]}")
+            logger.warning("message is empty: %r", message)
 
     def update_text_edit(self, message: str) -> None:
         self.history.append(message)
@@ -1,30 +1,403 @@
 import sys
 import os
 import csv
+import functools
+import logging
+import numpy as np
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt, QThread, QTimer, Signal, Slot
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget,
-    QTableWidget, QTableWidgetItem, QDialog, QLabel, QComboBox,
-    QSpinBox, QGridLayout, QMessageBox, QLineEdit, QHBoxLayout, QFileDialog, QGroupBox, QInputDialog
+    QApplication, QPushButton, QVBoxLayout,
+    QTableView, QHeaderView, QDialog, QLabel,
+    QSpinBox, QMessageBox, QLineEdit, QHBoxLayout, QFileDialog, QGroupBox
 )
-from PySide6.QtGui import QColor
+from PySide6.QtGui import QColor, QKeySequence, QPalette, QUndoCommand, QUndoStack
+
+logger = logging.getLogger(__name__)
+
+# ✅ Shared cell colours, returned by reference instead of allocated per data() call
+# 🔴 empty, 🔵 single measurement, 🟢 multiple measurements; index with min(count, 2)
+COLOR_BY_COUNT = (QColor("red"), QColor("blue"), QColor("green"))
+SELECTED_COLOR = QColor("purple")
+
+# ✅ Every role PlateModel derives from a cell's statistics, sent with dataChanged
+CELL_ROLES = [Qt.DisplayRole, Qt.BackgroundRole, Qt.ToolTipRole]
+
+
+@functools.lru_cache(maxsize=32)
+def plate_labels(rows, cols):
+    """Returns the row ('A', ...), column ('1', ...) and position ('A1', ...) labels of a plate size."""
+    row_labels = tuple(chr(65 + row) for row in range(rows))
+    col_labels = tuple(str(col + 1) for col in range(cols))
+    pos_labels = tuple(tuple(row + col for col in col_labels) for row in row_labels)
+    return row_labels, col_labels, pos_labels
+
+
+@functools.lru_cache(maxsize=None)
+def plate_data_dir(working_dir):
+    """Returns the plate_data directory under a working directory, creating it the first time it is asked for."""
+    path = os.path.join(working_dir, 'plate_data')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+@functools.lru_cache(maxsize=32)
+def label_positions(rows, cols):
+    """Returns a mapping from position label ('A1', ...) to (row, col) for a plate size."""
+    _, _, pos_labels = plate_labels(rows, cols)
+    return {label: (row, col) for row, labels in enumerate(pos_labels) for col, label in enumerate(labels)}
+
+
+class PlateModel(QAbstractTableModel):
+    """
+    Table model for a plate. The per-cell statistics are stored as one NumPy array per statistic,
+    indexed by (row, col). Cell text, colour and tooltip are derived from them on demand, so the
+    view only ever asks for the cells it paints.
+
+    The arrays are always C-ordered (row-major), so a row of cells is one contiguous run of memory.
+    They are only ever allocated by new_stats(), keep it that way when adding statistics.
+    """
+
+    # Name, dtype and empty-cell value of each per-cell statistic array
+    STATS = (
+        ("counts", np.int32, 0),  # 0 means the cell is empty
+        ("sums", np.float64, 0.0),  # sum of all samples, the average is sums / counts
+        ("mins", np.float64, np.inf),  # inf / -inf until a minimum / maximum is known
+        ("maxs", np.float64, -np.inf),
+    )
+
+    TOOLTIP_TEMPLATE = "🔹 Cell: {pos}\n📊 Count: {count}\n📈 Avg: {avg:.2f}\n🔽 Min: {min}\n🔼 Max: {max}"
+
+    def __init__(self, rows, cols, parent=None):
+        super().__init__(parent)
+        self.rows = rows
+        self.cols = cols
+        for name, values in self.new_stats(rows, cols).items():
+            setattr(self, name, values)
+        self.render_cache = {}  # (row, col) -> {role: value}, dropped whenever the cell changes
+        self.rebuild_labels()
+
+    @classmethod
+    def new_stats(cls, rows, cols):
+        """Allocates empty, C-ordered statistic arrays for a plate size, keyed by name."""
+        return {name: np.full((rows, cols), fill, dtype=dtype, order="C") for name, dtype, fill in cls.STATS}
+
+    def rebuild_labels(self):
+        """Picks up the header and position labels for the current dimensions."""
+        self.row_labels, self.col_labels, self.pos_labels = plate_labels(self.rows, self.cols)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.cols
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.col_labels[section]
+        return self.row_labels[section]
+
+    def flags(self, index):
+        # ✅ Cells are filled by imports, never edited in place
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled if index.isValid() else Qt.NoItemFlags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in CELL_ROLES or not index.isValid():
+            return None  # ✅ Font, alignment, decoration, ... are asked for too; don't cache them per cell
+
+        # ✅ The view asks for several roles per cell on every repaint, format each one only once
+        key = (index.row(), index.column())
+        cached = self.render_cache.get(key)
+        if cached is None:
+            cached = self.render_cache[key] = {}
+        try:
+            return cached[role]  # ✅ One lookup on the common, already-rendered path
+        except KeyError:
+            value = cached[role] = self.render(key[0], key[1], role)
+            return value
+
+    def render(self, row, col, role):
+        """Computes the value of a role for a cell from its statistics."""
+        count = int(self.counts[row, col])
+
+        if role == Qt.DisplayRole:
+            if count == 0:
+                return None
+            return f"Avg: {self.sums[row, col] / count:.2f} / {count}"  # ✅ Display count & average
+
+        if role == Qt.BackgroundRole:
+            return COLOR_BY_COUNT[min(count, 2)]
+
+        if role == Qt.ToolTipRole and count:
+            # ✅ Only built when a cell is hovered, then kept in the render cache
+            count, avg_value, min_value, max_value = self.cell_stats(row, col)
+            return self.TOOLTIP_TEMPLATE.format_map({
+                "pos": self.pos_labels[row][col],
+                "count": count,
+                "avg": avg_value,
+                "min": min_value if np.isfinite(min_value) else "-",
+                "max": max_value if np.isfinite(max_value) else "-",
+            })
+
+        return None
+
+    def cell_stats(self, row, col):
+        """Returns (count, avg, min, max) of a cell as plain Python numbers."""
+        count = int(self.counts[row, col])
+        return (
+            count,
+            float(self.sums[row, col]) / count if count else 0.0,
+            float(self.mins[row, col]),
+            float(self.maxs[row, col]),
+        )
+
+    def resize(self, rows, cols):
+        """Changes the plate dimensions, keeping the data of cells that are still on the plate."""
+        if rows == self.rows and cols == self.cols:
+            return  # ✅ Nothing to do, and a reset would make the view re-read every header and cell
+        self.beginResetModel()
+        keep_rows = min(rows, self.rows)
+        keep_cols = min(cols, self.cols)
+        for name, new in self.new_stats(rows, cols).items():
+            new[:keep_rows, :keep_cols] = getattr(self, name)[:keep_rows, :keep_cols]
+            setattr(self, name, new)
+        self.rows = rows
+        self.cols = cols
+        self.rebuild_labels()
+        self.render_cache.clear()
+        self.endResetModel()
+
+    def set_cells(self, rows, cols, counts, avgs, mins, maxs):
+        """
+        Overwrites the statistics of many cells at once. Entries outside the plate are ignored,
+        and when a cell appears more than once the last entry wins.
+        """
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        rows, cols, counts, avgs, mins, maxs = (a[inside] for a in (rows, cols, counts, avgs, mins, maxs))
+        if not len(rows):
+            return
+
+        # ✅ Keep only the last entry for each cell, fancy assignment does not define an order
+        _, last = np.unique((rows * self.cols + cols)[::-1], return_index=True)
+        keep = len(rows) - 1 - last
+        rows, cols, counts, mins, maxs = rows[keep], cols[keep], counts[keep], mins[keep], maxs[keep]
+        sums = avgs[keep] * counts
+
+        # ✅ Re-loading what the plate already shows must not repaint anything
+        changed = ((self.counts[rows, cols] != counts) | (self.sums[rows, cols] != sums)
+                   | (self.mins[rows, cols] != mins) | (self.maxs[rows, cols] != maxs))
+        if not changed.any():
+            return
+        rows, cols, counts, sums, mins, maxs = (a[changed] for a in (rows, cols, counts, sums, mins, maxs))
+
+        self.counts[rows, cols] = counts
+        self.sums[rows, cols] = sums
+        self.mins[rows, cols] = mins
+        self.maxs[rows, cols] = maxs
+        self.render_cache.clear()
+        # ✅ Repaint only the bounding box of the cells that changed
+        self.dataChanged.emit(self.index(int(rows.min()), int(cols.min())),
+                              self.index(int(rows.max()), int(cols.max())), CELL_ROLES)
+
+    def add_measurement(self, row, col, avg_value, min_value, max_value, count):
+        """Merges the statistics of `count` new samples into a cell."""
+        key = (row, col)  # ✅ Built once, reused for every array below
+        mins, maxs = self.mins, self.maxs
+        self.sums[key] += avg_value * count
+        if min_value < mins[key]:
+            mins[key] = min_value  # ✅ Only lower if the new minimum is lower
+        if max_value > maxs[key]:
+            maxs[key] = max_value  # ✅ Only raise if the new maximum is higher
+        self.counts[key] += count
+        self.cell_changed(row, col)
+
+    def add_measurements(self, rows, cols, avgs, mins, maxs, counts):
+        """
+        Merges many imports at once, like add_measurement per entry but with a single repaint. Entries
+        outside the plate are ignored, and a cell may appear more than once.
+        """
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        if not inside.any():
+            return
+        key = (rows[inside], cols[inside])
+
+        # ✅ Unbuffered ufunc.at so repeated cells accumulate instead of overwriting each other
+        np.add.at(self.sums, key, avgs[inside] * counts[inside])
+        np.minimum.at(self.mins, key, mins[inside])
+        np.maximum.at(self.maxs, key, maxs[inside])
+        np.add.at(self.counts, key, counts[inside])
+
+        self.render_cache.clear()
+        rows, cols = key
+        self.dataChanged.emit(self.index(int(rows.min()), int(cols.min())),
+                              self.index(int(rows.max()), int(cols.max())), CELL_ROLES)
+
+    def cell_changed(self, row, col):
+        self.render_cache.pop((row, col), None)
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index, CELL_ROLES)
+
+    @staticmethod
+    def rect_indices(rects):
+        """Returns the (rows, cols) index arrays of the cells in (top, left, bottom, right) rectangles."""
+        grids = [np.mgrid[top:bottom + 1, left:right + 1].reshape(2, -1) for top, left, bottom, right in rects]
+        return tuple(np.concatenate(grids, axis=1))
+
+    def get_cells(self, rects):
+        """Returns copies of the (counts, sums, mins, maxs) of the cells in the given rectangles."""
+        rows, cols = self.rect_indices(rects)
+        return tuple(values[rows, cols] for values in (self.counts, self.sums, self.mins, self.maxs))
+
+    def put_cells(self, rects, stats):
+        """Writes (counts, sums, mins, maxs), as get_cells returns them or as scalars, to the rectangles."""
+        rows, cols = self.rect_indices(rects)
+        for values, new_values in zip((self.counts, self.sums, self.mins, self.maxs), stats):
+            values[rows, cols] = new_values
+        if len(rows) <= len(self.render_cache):
+            for key in zip(rows.tolist(), cols.tolist()):
+                self.render_cache.pop(key, None)
+        else:
+            # ✅ Large ranges: mark them in a mask and walk the (smaller) cache instead of every cell
+            changed = np.zeros((self.rows, self.cols), dtype=bool)
+            changed[rows, cols] = True
+            self.render_cache = {key: roles for key, roles in self.render_cache.items() if not changed[key]}
+        # ✅ One signal per rectangle, so disjoint selections don't repaint the cells between them
+        for top, left, bottom, right in rects:
+            self.dataChanged.emit(self.index(top, left), self.index(bottom, right), CELL_ROLES)
+
+    def clear(self):
+        """Removes the data of every cell."""
+        for name, _, fill in self.STATS:
+            getattr(self, name).fill(fill)
+        self.render_cache.clear()
+        # ✅ The shape is unchanged, so repaint the cells rather than resetting the whole model
+        self.dataChanged.emit(self.index(0, 0), self.index(self.rows - 1, self.cols - 1), CELL_ROLES)
+
+
+class ClearCellsCommand(QUndoCommand):
+    """Clears a set of plate cells, keeping their statistics so the clear can be undone."""
+
+    def __init__(self, model, rects):
+        super().__init__("Clear cells")
+        self.model = model
+        self.rects = rects  # (top, left, bottom, right) of each selected range
+        self.saved = model.get_cells(rects)
+
+    def redo(self):
+        self.model.put_cells(self.rects, (0, 0.0, np.inf, -np.inf))
+
+    def undo(self):
+        self.model.put_cells(self.rects, self.saved)
+
+
+class PlateView(QTableView):
+    """
+    Table view whose cell size comes from the font metrics of a canonical cell string, so Qt
+    never has to format and measure every cell of the model to size a row or column.
+    """
+
+    SAMPLE_TEXT = "Avg: 999.99 / 999"
+
+    def sizeHintForColumn(self, column):
+        return self.fontMetrics().horizontalAdvance(self.SAMPLE_TEXT) + 12
+
+    def sizeHintForRow(self, row):
+        return self.fontMetrics().height() + 6
+
+
+class PlateFileWriter(QObject):
+    """
+    Appends rows to plate CSV files from a background thread. Requests are handled in the order
+    they are sent, so a removal always lands after the rows queued before it. The current plate
+    file stays open between batches and is only reopened when the plate changes.
+    """
+
+    OnFailed = Signal(str, str, list)  # file path, error message, rows that were not written
+
+    def __init__(self):
+        super().__init__()
+        self.file_path = None
+        self.csvfile = None
+        self.writer = None
+
+    @Slot(str, list)
+    def append_rows(self, file_path, rows):
+        try:
+            if file_path != self.file_path:
+                self.close()
+                self.csvfile = open(file_path, "a", newline='', encoding="utf-8")
+                self.writer = csv.writer(self.csvfile)
+                self.file_path = file_path
+            self.writer.writerows(rows)
+            self.csvfile.flush()  # ✅ The dialog may read the file back right after a sync
+            logger.debug("%d measurement(s) saved to file at %s", len(rows), file_path)
+        except OSError as e:
+            self.close()  # ✅ Reopen on the next batch rather than reuse a broken handle
+            self.OnFailed.emit(file_path, str(e), rows)
+
+    @Slot(str)
+    def remove_file(self, file_path):
+        if file_path == self.file_path:
+            self.close()
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+    @Slot()
+    def sync(self):
+        """Does nothing; returning from a blocking call to it means every earlier request is done."""
+
+    def close(self):
+        """Closes the open plate file, if any."""
+        if self.csvfile is not None:
+            try:
+                self.csvfile.close()
+            except OSError as e:
+                logger.error("Failed to close %s: %s", self.file_path, e)
+        self.file_path = None
+        self.csvfile = None
+        self.writer = None
+
 
 class SurfaceMappingDialog(QDialog):
+    write_rows = Signal(str, list)
+    remove_file = Signal(str)
+    sync_file = Signal()
+
     def __init__(self, main_window, plate_name=None, rows=4, cols=4):
         super().__init__()
-        self.cell_data = {} #create a dictionary for storing cell data
         self.main_window = main_window
         self.rows = rows
         self.cols = cols
-        self.plate_data_dir = os.path.abspath(os.path.join(os.getcwd(), 'plate_data'))
-        os.makedirs(self.plate_data_dir, exist_ok=True)
+        self.model = PlateModel(rows, cols, self)
+        self.plate_data_dir = plate_data_dir(os.getcwd())
         
         # ✅ Modify to start with a blank sheet instead of opening a file picker
         self.plate_name = plate_name if plate_name else "NewPlate"
         self.file_path = os.path.join(self.plate_data_dir, f"{self.plate_name}_measurements.csv")
-        
+
+        # ✅ Rows are appended to file_path in batches instead of opening the file per measurement
+        self.pending_rows = []
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(2000)
+        self.flush_timer.timeout.connect(self.flush_rows)
+
+        # ✅ The file I/O itself runs on its own thread so imports never wait on the disk
+        self.file_writer = PlateFileWriter()
+        self.writer_thread = QThread(self)
+        self.file_writer.moveToThread(self.writer_thread)
+        # ✅ Connected once here and queued explicitly, every call crosses the thread boundary
+        self.write_rows.connect(self.file_writer.append_rows, Qt.QueuedConnection)
+        self.remove_file.connect(self.file_writer.remove_file, Qt.QueuedConnection)
+        self.sync_file.connect(self.file_writer.sync, Qt.BlockingQueuedConnection)
+        self.file_writer.OnFailed.connect(self.rows_not_saved, Qt.QueuedConnection)
+        self.writer_thread.start()
+
         self.init_ui()
-        self.table.itemSelectionChanged.connect(self.restore_background_colors)
-        self.import_measurement_button.clicked.connect(lambda: print("[DEBUG] Import Measurement Button Clicked!") or self.import_computed_measurement())
+        self.import_measurement_button.clicked.connect(self.import_computed_measurement)
 
 
     def init_ui(self):
@@ -44,9 +417,23 @@ class SurfaceMappingDialog(QDialog):
 
         surface_map_layout.addLayout(info_layout)
         
-        self.table = QTableWidget(self.rows, self.cols)
-        self.update_table_headers()
-        self.restore_background_colors()
+        self.table = PlateView()
+        self.table.setModel(self.model)
+
+        # ✅ Clears are undoable instead of confirmed; indices are stale once the plate is resized
+        self.undo_stack = QUndoStack(self)
+        self.model.modelReset.connect(self.undo_stack.clear)
+        undo_action = self.undo_stack.createUndoAction(self)
+        undo_action.setShortcut(QKeySequence.Undo)
+        self.addAction(undo_action)
+        for header, size in ((self.table.horizontalHeader(), self.table.sizeHintForColumn(0)),
+                             (self.table.verticalHeader(), self.table.sizeHintForRow(0))):
+            header.setSectionResizeMode(QHeaderView.Fixed)
+            header.setDefaultSectionSize(size)
+        # ✅ Selected cells show purple, painted by the view instead of restyling every cell
+        palette = self.table.palette()
+        palette.setColor(QPalette.Highlight, SELECTED_COLOR)
+        self.table.setPalette(palette)
         surface_map_layout.addWidget(self.table)
 
         button_layout = QHBoxLayout()
@@ -67,13 +454,6 @@ class SurfaceMappingDialog(QDialog):
         main_layout.addWidget(surface_map_widget)
         self.setLayout(main_layout)
 
-        """  for row in range(self.rows):
-            for col in range(self.cols):
-                item = QTableWidgetItem("0")
-                item.setBackground(QColor("red"))
-                self.table.setItem(row, col, item)
-         """
-       
     def select_existing_plate(self):
         """Prompt user to select an existing plate file."""
         options = QFileDialog.Options()
@@ -84,76 +464,32 @@ class SurfaceMappingDialog(QDialog):
     
     def import_computed_measurement(self):
         """Fetch computed statistics (avg, min, max, count) and store them in the table."""
-        print("[DEBUG] import_computed_measurement() called!")
+        logger.debug("import_computed_measurement() called")
 
         if hasattr(self.main_window, 'compute_overall_measurement'):
             avg_value, min_value, max_value, count = self.main_window.compute_overall_measurement()  # ✅ Unpack returned values
         else:
-            print("[ERROR] compute_overall_measurement() not found in MainWindow!")
+            logger.error("compute_overall_measurement() not found in MainWindow")
             QMessageBox.critical(self, "Error", "Measurement computation function is missing!")
             return
 
         if avg_value is None:
-            print("[WARNING] No valid data found to compute average!")
+            logger.warning("No valid data found to compute average")
             QMessageBox.warning(self, "No Data", "No valid measurement data found.")
             return
 
-        print(f"[DEBUG] Computed Measurement: Avg={avg_value}, Min={min_value}, Max={max_value}, Count={count}")
+        logger.debug("Computed Measurement: Avg=%s, Min=%s, Max=%s, Count=%s", avg_value, min_value, max_value, count)
 
         # ✅ Pass all values correctly
         self.handle_measurement_import(avg_value, min_value, max_value, count)
 
 
 
-    def update_table_display(self, row, col, count, avg_value):
-        """Updates the cell UI with measurement statistics."""
-        cell_item = self.table.item(row, col)
-        if not cell_item:
-            cell_item = QTableWidgetItem()
-            self.table.setItem(row, col, cell_item)
-
-        # ✅ Display count & average
-        cell_item.setText(f"Avg: {avg_value:.2f} / {count}")
-
-        # ✅ Retrieve detailed data from storage
-        pos_label = f"{chr(65 + row)}{col + 1}"
-        if pos_label in self.cell_data:
-            cell_info = self.cell_data[pos_label]
-            count = cell_info["count"]
-            avg = cell_info["avg"]
-            min_value = cell_info["min"]
-            max_value = cell_info["max"]
-
-        # ✅ Set tooltip text (display on hover)
-        tooltip_text = (
-            f"🔹 Cell: {pos_label}\n"
-            f"📊 Count: {count}\n"
-            f"📈 Avg: {avg:.2f}\n"
-            f"🔽 Min: {min_value}\n"
-            f"🔼 Max: {max_value}"
-        )
-        cell_item.setToolTip(tooltip_text)  # ✅ Show full details on hover
-
-        # ✅ Change color based on data state
-        if count == 1:
-            cell_item.setBackground(QColor("blue"))  # 🔵 Single measurement
-        elif count > 1:
-            cell_item.setBackground(QColor("green"))  # 🟢 Multiple measurements
-        else:
-            cell_item.setBackground(QColor("red"))  # 🔴 Empty cell (should never happen)
-
     def update_table_size(self):
         """Update table size when row or column values change."""
         self.rows = self.rows_spinbox.value()
         self.cols = self.cols_spinbox.value()
-        self.table.setRowCount(self.rows)
-        self.table.setColumnCount(self.cols)
-        self.update_table_headers()
-
-    def update_table_headers(self):
-        """Update row and column headers when the table size changes."""
-        self.table.setHorizontalHeaderLabels([str(i+1) for i in range(self.cols)])
-        self.table.setVerticalHeaderLabels([chr(65+i) for i in range(self.rows)])
+        self.model.resize(self.rows, self.cols)
 
     def create_new_plate(self):
         """Prompt user to enter a new plate name, rows, and columns."""
@@ -196,10 +532,7 @@ class SurfaceMappingDialog(QDialog):
                 self.rows = new_rows
                 self.cols = new_cols
                 self.plate_name_label.setText(f"Plate: {self.plate_name}")
-                self.table.setRowCount(self.rows)
-                self.table.setColumnCount(self.cols)
-                self.update_table_headers()
-                self.restore_background_colors()
+                self.model.resize(self.rows, self.cols)
                 dialog.accept()
             else:
                 QMessageBox.warning(dialog, "No Plate Created", "No plate name entered.")
@@ -208,9 +541,49 @@ class SurfaceMappingDialog(QDialog):
         cancel_button.clicked.connect(dialog.reject)
         dialog.exec()
 
+    def queue_row(self, row):
+        """Queues a row for file_path; it is written by the next flush_rows."""
+        self.pending_rows.append(row)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush_rows(self):
+        """Hands every queued row to the file writer as a single append."""
+        self.flush_timer.stop()
+        if not self.pending_rows:
+            return
+        rows, self.pending_rows = self.pending_rows, []
+        self.writer_thread.start()  # ✅ No-op unless the writer was stopped by a previous close
+        self.write_rows.emit(self.file_path, rows)
+
+    def sync_rows(self):
+        """Flushes the queued rows and waits until the file writer has written them."""
+        self.flush_rows()
+        if self.writer_thread.isRunning():
+            self.sync_file.emit()
+
+    def rows_not_saved(self, file_path, error, rows):
+        logger.error("Failed to save measurement to %s: %s", file_path, error)
+        if file_path == self.file_path:
+            self.pending_rows[:0] = rows  # ✅ Keep them for the next flush
+        QMessageBox.critical(self, "Error", f"Failed to save measurement: {error}")
+
+    def stop_file_writer(self):
+        """Writes the queued rows and stops the file writer thread."""
+        self.sync_rows()  # ✅ quit() alone can drop requests the thread has not picked up yet
+        if self.writer_thread.isRunning():  # ✅ Closing twice must not wait on a stopped thread
+            self.writer_thread.quit()
+            self.writer_thread.wait()
+        self.file_writer.close()  # ✅ Safe from here, the writer thread is no longer running
+
+    def closeEvent(self, event):
+        self.stop_file_writer()
+        super().closeEvent(event)
+
     def update_plate_name(self):
         new_name = self.plate_name_input.text().strip()
         if new_name:
+            self.flush_rows()  # ✅ Queued rows belong to the old plate file
             self.plate_name = new_name
             self.file_path = os.path.join(self.plate_data_dir, f"{new_name}_measurements.csv")
             QMessageBox.information(self, "Updated", f"Plate name set to {new_name}.")
@@ -219,199 +592,125 @@ class SurfaceMappingDialog(QDialog):
         reply = QMessageBox.question(self, "Confirm Reset", "Are you sure you want to reset all data for this plate?", 
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
-            if os.path.exists(self.file_path):
-                os.remove(self.file_path)
-            for row in range(self.rows):
-                for col in range(self.cols):
-                    item = self.table.item(row, col)
-                    item.setText("0")
-                    item.setBackground(QColor("red"))
+            self.pending_rows.clear()
+            self.flush_timer.stop()
+            self.writer_thread.start()
+            self.remove_file.emit(self.file_path)  # ✅ After any rows already sent to the writer
+            self.model.clear()
+            self.undo_stack.clear()
             QMessageBox.information(self, "Reset", "Plate data has been reset.")
     
     def load_existing_measurements(self):
-        if os.path.exists(self.file_path):
-            with open(self.file_path, newline='', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                data = list(reader)
-
-                for row in data[1:]:  # Skip header
-                    if len(row) < 3:
-                        continue  # ✅ Skip rows that don't have enough values
-                    
-                    pos_label, avg_value, count = row[:3]  # ✅ Extract only the first 3 values
-
-                    row_idx = ord(pos_label[0]) - 65  # Convert 'A' to index 0
-                    col_idx = int(pos_label[1:]) - 1  # Convert '1' to index 0
+        self.sync_rows()
 
-                    if not self.table.item(row_idx, col_idx):
-                        self.table.setItem(row_idx, col_idx, QTableWidgetItem(str(count)))
-
-                    cell_item = self.table.item(row_idx, col_idx)
-
-                    if count == "1":
-                        cell_item.setBackground(QColor("blue"))
-                    else:
-                        cell_item.setBackground(QColor("green"))
+        try:
+            with open(self.file_path, newline='', encoding='utf-8') as csvfile:
+                records = list(csv.reader(csvfile))
+        except FileNotFoundError:
+            return  # ✅ Nothing measured on this plate yet
+
+        # ✅ Rows are [pos, count, avg, min, max]; files from before that format have [pos, avg, count].
+        # Anything else, or a row that doesn't parse, is skipped.
+        labels, stats = [], []
+        for record in records:
+            try:
+                if len(record) == 5:
+                    count, avg_value, min_value, max_value = map(float, record[1:])
+                elif len(record) == 3:
+                    avg_value, count = map(float, record[1:])
+                    min_value, max_value = np.inf, -np.inf
+                else:
+                    continue
+            except ValueError:
+                continue
+            if count >= 1:
+                labels.append(record[0])
+                stats.append((count, avg_value, min_value, max_value))
+        if not labels:
+            return
 
-                    cell_item.setText(str(count))
+        # ✅ Look each distinct label up once, e.g. 'B12' -> (1, 11); labels not on this plate map to -1
+        labels, inverse = np.unique(labels, return_inverse=True)
+        positions = label_positions(self.model.rows, self.model.cols)
+        cells = np.array([positions.get(label, (-1, -1)) for label in labels.tolist()], dtype=np.intp).reshape(-1, 2)
+        row_idx, col_idx = cells[inverse.ravel()].T
+
+        counts, avgs, mins, maxs = np.array(stats, dtype=np.float64).T
+        self.model.set_cells(row_idx, col_idx, counts.astype(np.int32), avgs, mins, maxs)
+        self.undo_stack.clear()  # ✅ Undo snapshots were taken of the cells before they were loaded
+
+    def first_selected_cell(self):
+        """
+        Returns (row, col) of the first selected cell and how many cells are selected, read from the
+        selection ranges instead of listing every selected index.
+        """
+        selection = self.table.selectionModel().selection()
+        if selection.isEmpty():
+            return None, 0
+        top_left = selection[0].topLeft()
+        return (top_left.row(), top_left.column()), sum(r.width() * r.height() for r in selection)
 
     def save_measurement(self):
-        selected = self.table.selectedIndexes()
-        if len(selected) > 1:
+        cell, selected_count = self.first_selected_cell()
+        if selected_count > 1:
             QMessageBox.warning(self, "Multiple Selection", "Please select only one cell to save measurement.")
             return
         
-        if not selected:
+        if cell is None:
             QMessageBox.warning(self, "No Cell Selected", "Please select a cell to save data.")
             return
         
-        row = selected[0].row()
-        col = selected[0].column()
-        pos_label = f"{chr(65 + row)}{col + 1}"
+        row, col = cell
+        pos_label = self.model.pos_labels[row][col]
 
-        avg_value = 10.0  # Placeholder for measurement value
+        measurement = 10.0  # Placeholder for measurement value
 
-        # ✅ Get the existing count, defaulting to 0
-        existing_item = self.table.item(row, col)
-        existing_count = int(existing_item.text()) if existing_item.text().isdigit() else 0
+        # ✅ Fold the single sample into the cell's running average
+        self.model.add_measurement(row, col, measurement, measurement, measurement, 1)
+        self.undo_stack.clear()  # ✅ An earlier Clear's undo snapshot would overwrite this sample
+        cell_count, cell_avg, cell_min, cell_max = self.model.cell_stats(row, col)
 
-        # ✅ First measurement case
-        if existing_count == 0:
-            new_sample = 1
-            existing_item.setText(str(new_sample))  # Set to "1"
-            existing_item.setBackground(QColor("blue"))  # ✅ Turn Blue
-        else:
-            # ✅ Subsequent measurements (Green, averaged)
-            new_sample = existing_count + 1
-            avg_value = (avg_value * existing_count + float(existing_count)) / new_sample
-            existing_item.setText(str(new_sample))
-            existing_item.setBackground(QColor("green"))
-
-        # ✅ Save measurement to file
-        with open(self.file_path, "a", newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow([pos_label, avg_value, new_sample])
+        # ✅ Queue the measurement for the plate file, in the same row format as imports
+        self.queue_row([pos_label, cell_count, cell_avg, cell_min, cell_max])
 
         QMessageBox.information(self, "Saved", f"Measurement saved to {pos_label}.")
 
     def handle_measurement_import(self, avg_value: float, min_value: float, max_value: float, count: int):
         """Stores and updates measurement statistics for a selected cell."""
-        print(f"[DEBUG] handle_measurement_import called with Avg={avg_value}, Min={min_value}, Max={max_value}, Count={count}")
+        logger.debug("handle_measurement_import called with Avg=%s, Min=%s, Max=%s, Count=%s",
+                     avg_value, min_value, max_value, count)
 
-        selected = self.table.selectedIndexes()
-        if not selected:
-            print("[DEBUG] No cell selected!")
+        cell, _ = self.first_selected_cell()
+        if cell is None:
+            logger.debug("No cell selected")
             QMessageBox.warning(self, "No Cell Selected", "Please select a cell to store the measurement.")
             return
 
-        row = selected[0].row()
-        col = selected[0].column()
-        pos_label = f"{chr(65 + row)}{col + 1}"
+        row, col = cell
+        pos_label = self.model.pos_labels[row][col]
 
-        print(f"[DEBUG] Cell selected at {pos_label}")
+        logger.debug("Cell selected at %s", pos_label)
 
-        # ✅ Initialize cell data storage if not already stored
-        if pos_label not in self.cell_data:
-            self.cell_data[pos_label] = {
-                "count": count,
-                "avg": avg_value,
-                "min": min_value,
-                "max": max_value
-            }
-        else:
-            # ✅ Retrieve existing values
-            cell_info = self.cell_data[pos_label]
-            prev_count = cell_info["count"]
-            prev_avg = cell_info["avg"]
-            prev_min = cell_info["min"]
-            prev_max = cell_info["max"]
-
-            # ✅ Compute new rolling statistics
-            new_count = prev_count + count
-            new_avg = ((prev_avg * prev_count) + (avg_value * count)) / new_count
-            new_min = min(prev_min, min_value)  # ✅ Ensure min updates only if new measurement is lower
-            new_max = max(prev_max, max_value)  # ✅ Ensure max updates only if new measurement is higher
-
-            # ✅ Store updated statistics
-            self.cell_data[pos_label] = {
-                "count": new_count,
-                "avg": new_avg,
-                "min": new_min,
-                "max": new_max
-            }
+        # ✅ Fold the import into the cell's rolling statistics
+        self.model.add_measurement(row, col, avg_value, min_value, max_value, count)
+        self.undo_stack.clear()  # ✅ An earlier Clear's undo snapshot would overwrite this import
+        cell_count, cell_avg, cell_min, cell_max = self.model.cell_stats(row, col)
 
         # ✅ Debugging Output
-        print(f"[DEBUG] Updated {pos_label}: Count={self.cell_data[pos_label]['count']}, "
-            f"Avg={self.cell_data[pos_label]['avg']:.2f}, Min={self.cell_data[pos_label]['min']}, "
-            f"Max={self.cell_data[pos_label]['max']}")
-
-        # ✅ Update table display
-        self.update_table_display(row, col, self.cell_data[pos_label]["count"], self.cell_data[pos_label]["avg"])
-
-        # ✅ Save to file (optional)
-        try:
-            with open(self.file_path, "a", newline='', encoding="utf-8") as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow([pos_label, self.cell_data[pos_label]["count"], self.cell_data[pos_label]["avg"],
-                                self.cell_data[pos_label]["min"], self.cell_data[pos_label]["max"]])
-                print(f"[DEBUG] Measurement saved to file at {self.file_path}")
-        except Exception as e:
-            print(f"[ERROR] Failed to save measurement: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to save measurement: {e}")
-
-    def update_table_headers(self):
-        """Update row and column headers when the table size changes."""
-        self.table.setHorizontalHeaderLabels([str(i+1) for i in range(self.cols)])
-        self.table.setVerticalHeaderLabels([chr(65+i) for i in range(self.rows)])
-    
+        logger.debug("Updated %s: Count=%d, Avg=%.2f, Min=%s, Max=%s",
+                     pos_label, cell_count, cell_avg, cell_min, cell_max)
 
+        # ✅ Queue the measurement for the plate file
+        self.queue_row([pos_label, cell_count, cell_avg, cell_min, cell_max])
 
     def clear_selected_cells(self):
-        selected = self.table.selectedIndexes()
-        if not selected:
+        selection = self.table.selectionModel().selection()
+        if selection.isEmpty():
             QMessageBox.warning(self, "No Cell Selected", "Please select a cell to clear.")
             return
-        reply = QMessageBox.question(self, "Confirm Clear", "Are you sure you want to clear the selected cells?", 
-                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-        
-        row = selected[0].row()
-        col = selected[0].column()
-        pos_label = f"{chr(65 + row)}{col + 1}"
-        
-        reply = QMessageBox.question(self, "Confirm Delete", f"Clear data for selected range?", 
-                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-        if reply == QMessageBox.Yes:
-            for index in selected:
-                row = index.row()
-                col = index.column()
-                self.table.setItem(row, col, QTableWidgetItem("0"))
-                self.table.item(row, col).setBackground(QColor("red"))
-            QMessageBox.information(self, "Cleared", "Selected cells have been cleared.")
-
-    def restore_background_colors(self):
-        """Restore default background colors based on data."""
-        for row in range(self.rows):
-            for col in range(self.cols):
-                item = self.table.item(row, col)
-                if item:
-                    count = int(item.text()) if item.text().isdigit() else 0
-                    if count == 0:
-                        item.setBackground(QColor("red"))  # ✅ Start as Red
-                    elif count == 1:
-                        item.setBackground(QColor("blue"))  # ✅ First measurement (Blue)
-                    else:
-                        item.setBackground(QColor("green"))  # ✅ Multiple measurements (Green)
-                    
-                    # ✅ Ensure the style is cleared before selection
-                    item.setData(1, "")
-        
-        # ✅ Now, override selected cell color to Purple (🟣)
-        selected = self.table.selectedIndexes()
-        for index in selected:
-            item = self.table.item(index.row(), index.column())
-            if item:
-                item.setBackground(QColor("purple"))  # ✅ Change to Purple when selected
-                item.setData(1, "selected")  # ✅ Track selection with metadata
+
+        rects = [(r.top(), r.left(), r.bottom(), r.right()) for r in selection]
+        self.undo_stack.push(ClearCellsCommand(self.model, rects))  # ✅ Undo with Ctrl+Z
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
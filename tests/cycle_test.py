@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any
+
+from PySide6.QtCore import Qt
+
+from src.cycle import CyclicMeasurementSetupWindow
+
+
+def test_cycle_stops_after_total_duration(qtbot: Any) -> None:
+    dialog = CyclicMeasurementSetupWindow(None)
+    qtbot.addWidget(dialog)
+    dialog.cycle_time_sb.setValue(5)
+    dialog.total_duration_sb.setValue(10)
+
+    dialog.start_cycle()
+    assert dialog.cycle_timer.isActive()
+    assert not dialog.cycle_time_sb.isEnabled()
+
+    dialog.on_timer_tick()
+    assert dialog.cycle_timer.isActive()
+    dialog.on_timer_tick()
+
+    assert dialog.elapsed_cycles == 2
+    assert not dialog.cycle_timer.isActive()
+    assert dialog.pb_start.isEnabled()
+    assert dialog.cycle_time_sb.isEnabled()
+
+
+def test_cycle_timer_is_precise(qtbot: Any) -> None:
+    dialog = CyclicMeasurementSetupWindow(None)
+    qtbot.addWidget(dialog)
+
+    assert dialog.cycle_timer.timerType() == Qt.PreciseTimer
+
+
+def test_cycle_ignores_ticks_after_stop(qtbot: Any) -> None:
+    dialog = CyclicMeasurementSetupWindow(None)
+    qtbot.addWidget(dialog)
+
+    dialog.start_cycle()
+    dialog.stop_cycle()
+    dialog.on_timer_tick()
+
+    assert dialog.elapsed_cycles == 0
+
+
+def test_cycle_first_measurement_is_immediate(qtbot: Any) -> None:
+    dialog = CyclicMeasurementSetupWindow(None)
+    qtbot.addWidget(dialog)
+
+    with qtbot.waitSignal(dialog.onMeasurementTrigger, timeout=1000):
+        dialog.start_cycle()
+
+    dialog.stop_cycle()
+
+
+def test_cycle_skips_tick_while_measurement_in_flight(qtbot: Any) -> None:
+    dialog = CyclicMeasurementSetupWindow(None)
+    qtbot.addWidget(dialog)
+    dialog.total_duration_sb.setValue(60)
+    triggers = []
+    dialog.onMeasurementTrigger.connect(lambda: triggers.append(1))
+
+    dialog.start_cycle()
+    dialog.on_timer_tick()
+    dialog.on_timer_tick()
+    dialog.measurement_done()
+    dialog.on_timer_tick()
+
+    assert len(triggers) == 2
+    assert dialog.elapsed_cycles == 3
+    dialog.stop_cycle()
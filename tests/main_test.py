@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any
 
 from src.main import MainWindow
+from src.main import _settings_text
 
 
 def test_PixmapWidget(qtbot: Any) -> None:
@@ -12,3 +13,10 @@ def test_PixmapWidget(qtbot: Any) -> None:
     main.show()
 
     assert main.isVisible()
+
+
+def test_settings_text_matches_ini_read_back() -> None:
+    assert _settings_text(True) == "true"
+    assert _settings_text(5.9) == "5.9"
+    assert _settings_text([100, 200]) == _settings_text(["100", "200"])
+    assert _settings_text("1234") == "1234"
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+from PySide6.QtCore import QItemSelection
+from PySide6.QtCore import QItemSelectionModel
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor
+from PySide6.QtGui import QPalette
+from PySide6.QtWidgets import QMessageBox
+
+from src.surface_mapping_ui import SurfaceMappingDialog
+
+
+@pytest.fixture
+def dialog(qtbot: Any, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> SurfaceMappingDialog:
+    monkeypatch.chdir(tmp_path)
+    dialog = SurfaceMappingDialog(None, plate_name="TestPlate", rows=3, cols=2)
+    qtbot.addWidget(dialog)
+    return dialog
+
+
+def select_cell(dialog: SurfaceMappingDialog, row: int, col: int) -> None:
+    index = dialog.model.index(row, col)
+    dialog.table.selectionModel().select(index, QItemSelectionModel.ClearAndSelect)
+
+
+def test_model_dimensions_and_headers(dialog: SurfaceMappingDialog) -> None:
+    model = dialog.model
+    assert model.rowCount() == 3
+    assert model.columnCount() == 2
+    assert model.headerData(1, Qt.Vertical) == "B"
+    assert model.headerData(1, Qt.Horizontal) == "2"
+
+
+def test_only_cell_roles_are_cached(dialog: SurfaceMappingDialog) -> None:
+    index = dialog.model.index(0, 0)
+
+    assert dialog.model.data(index, Qt.FontRole) is None
+    assert dialog.model.data(index, Qt.BackgroundRole) == QColor("red")
+    assert dialog.model.render_cache == {(0, 0): {Qt.BackgroundRole: QColor("red")}}
+    assert not dialog.model.flags(index) & Qt.ItemIsEditable
+
+
+def test_resize_rebuilds_labels(dialog: SurfaceMappingDialog) -> None:
+    dialog.model.resize(4, 12)
+
+    assert dialog.model.headerData(3, Qt.Vertical) == "D"
+    assert dialog.model.headerData(11, Qt.Horizontal) == "12"
+    assert dialog.model.pos_labels[3][11] == "D12"
+    assert all(getattr(dialog.model, name).flags.c_contiguous for name, _, _ in dialog.model.STATS)
+
+    labels = dialog.model.pos_labels
+    dialog.model.resize(3, 2)
+    dialog.model.resize(4, 12)
+    assert dialog.model.pos_labels is labels
+
+
+def test_resize_to_same_dimensions_is_a_no_op(qtbot: Any, dialog: SurfaceMappingDialog) -> None:
+    with qtbot.assertNotEmitted(dialog.model.modelReset):
+        dialog.model.resize(3, 2)
+
+
+def test_handle_measurement_import_accumulates(dialog: SurfaceMappingDialog) -> None:
+    select_cell(dialog, 1, 0)
+
+    dialog.handle_measurement_import(2.0, 1.0, 3.0, 2)
+    index = dialog.model.index(1, 0)
+    assert dialog.model.data(index) == "Avg: 2.00 / 2"
+    assert dialog.model.data(index, Qt.BackgroundRole) == QColor("green")
+
+    dialog.handle_measurement_import(5.0, 0.5, 5.0, 1)
+    assert dialog.model.data(index) == "Avg: 3.00 / 3"
+    assert "Min: 0.5" in dialog.model.data(index, Qt.ToolTipRole)
+    assert "Max: 5.0" in dialog.model.data(index, Qt.ToolTipRole)
+
+    dialog.sync_rows()
+    assert Path(dialog.file_path).read_text().splitlines() == ["B1,2,2.0,1.0,3.0", "B1,3,3.0,0.5,5.0"]
+
+
+def test_add_measurements_matches_single_imports(qtbot: Any, dialog: SurfaceMappingDialog) -> None:
+    model = dialog.model
+    rows, cols = np.array([1, 1, 0, 7]), np.array([0, 0, 1, 0])
+    avgs, mins, maxs = np.array([2.0, 5.0, 1.0, 9.0]), np.array([1.0, 0.5, 1.0, 9.0]), np.array([3.0, 5.0, 1.0, 9.0])
+    counts = np.array([2, 1, 1, 1])
+
+    with qtbot.waitSignal(model.dataChanged) as blocker:
+        model.add_measurements(rows, cols, avgs, mins, maxs, counts)
+    top_left, bottom_right = blocker.args[:2]
+    assert (top_left.row(), top_left.column(), bottom_right.row(), bottom_right.column()) == (0, 0, 1, 1)
+
+    assert model.cell_stats(1, 0) == (3, 3.0, 0.5, 5.0)
+    assert model.cell_stats(0, 1) == (1, 1.0, 1.0, 1.0)
+    assert model.counts.sum() == 4  # the row 7 entry is off the plate
+
+
+def test_rows_are_written_in_one_batch(dialog: SurfaceMappingDialog) -> None:
+    select_cell(dialog, 0, 1)
+    dialog.handle_measurement_import(1.0, 1.0, 1.0, 1)
+    dialog.handle_measurement_import(3.0, 3.0, 3.0, 1)
+
+    assert not Path(dialog.file_path).exists()
+    assert dialog.flush_timer.isActive()
+
+    dialog.sync_rows()
+    assert Path(dialog.file_path).read_text().splitlines() == ["A2,1,1.0,1.0,1.0", "A2,2,2.0,1.0,3.0"]
+    assert dialog.pending_rows == []
+    assert not dialog.flush_timer.isActive()
+
+
+def test_selection_does_not_restyle_cells(qtbot: Any, dialog: SurfaceMappingDialog) -> None:
+    changed = []
+    dialog.model.dataChanged.connect(lambda *args: changed.append(args))
+
+    select_cell(dialog, 0, 0)
+    select_cell(dialog, 2, 1)
+
+    assert changed == []
+    assert dialog.table.palette().color(QPalette.Highlight) == QColor("purple")
+
+
+def test_plate_file_stays_open_between_batches(dialog: SurfaceMappingDialog) -> None:
+    select_cell(dialog, 0, 0)
+    dialog.handle_measurement_import(1.0, 1.0, 1.0, 1)
+    dialog.sync_rows()
+    csvfile = dialog.file_writer.csvfile
+
+    dialog.handle_measurement_import(3.0, 3.0, 3.0, 1)
+    dialog.sync_rows()
+
+    assert dialog.file_writer.csvfile is csvfile
+    assert Path(dialog.file_path).read_text().splitlines() == ["A1,1,1.0,1.0,1.0", "A1,2,2.0,1.0,3.0"]
+
+
+def test_reset_removes_file_after_written_rows(
+    qtbot: Any, dialog: SurfaceMappingDialog, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(QMessageBox, "question", lambda *args: QMessageBox.Yes)
+    monkeypatch.setattr(QMessageBox, "information", lambda *args: None)
+    select_cell(dialog, 0, 0)
+    dialog.handle_measurement_import(1.0, 1.0, 1.0, 1)
+    dialog.flush_rows()
+
+    with qtbot.assertNotEmitted(dialog.model.modelReset):
+        dialog.reset_plate_data()
+    dialog.sync_rows()
+
+    assert not Path(dialog.file_path).exists()
+    assert dialog.model.counts.sum() == 0
+    assert dialog.model.data(dialog.model.index(0, 0)) is None
+
+
+def test_stop_file_writer_writes_pending_rows(dialog: SurfaceMappingDialog) -> None:
+    select_cell(dialog, 0, 0)
+    dialog.handle_measurement_import(1.0, 1.0, 1.0, 1)
+
+    dialog.stop_file_writer()
+    dialog.stop_file_writer()
+
+    assert not dialog.writer_thread.isRunning()
+    assert dialog.file_writer.csvfile is None
+    assert Path(dialog.file_path).read_text().splitlines() == ["A1,1,1.0,1.0,1.0"]
+
+
+def test_load_existing_measurements(qtbot: Any, dialog: SurfaceMappingDialog) -> None:
+    Path(dialog.file_path).write_text("Position,Avg,Count\nA1,10.0,1\nB2,4.5,3\nC1\nA1,12.0,2\nZ9,1.0,1\nBx,1.0,1\n")
+
+    with qtbot.waitSignal(
+        dialog.model.dataChanged,
+        check_params_cb=lambda top_left, bottom_right, roles: (bottom_right.row(), bottom_right.column()) == (1, 1),
+    ):
+        dialog.load_existing_measurements()
+
+    assert dialog.model.cell_stats(0, 0)[:2] == (2, 12.0)
+    assert dialog.model.data(dialog.model.index(1, 1)) == "Avg: 4.50 / 3"
+    assert dialog.model.data(dialog.model.index(1, 1), Qt.ToolTipRole).splitlines()[1:] == [
+        "📊 Count: 3", "📈 Avg: 4.50", "🔽 Min: -", "🔼 Max: -"
+    ]
+    assert dialog.model.counts.sum() == 5
+
+    with qtbot.assertNotEmitted(dialog.model.dataChanged):
+        dialog.load_existing_measurements()
+
+
+def test_clear_selected_cells_can_be_undone(qtbot: Any, dialog: SurfaceMappingDialog) -> None:
+    for row, col, value in ((0, 0, 1.0), (2, 1, 4.0)):
+        select_cell(dialog, row, col)
+        dialog.handle_measurement_import(value, value, value, 1)
+    selection = QItemSelection(dialog.model.index(0, 0), dialog.model.index(0, 1))
+    selection.select(dialog.model.index(2, 1), dialog.model.index(2, 1))
+    dialog.table.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+
+    changed = []
+    dialog.model.dataChanged.connect(lambda top_left, bottom_right, roles: changed.append(
+        ((top_left.row(), top_left.column()), (bottom_right.row(), bottom_right.column()))
+    ))
+    dialog.clear_selected_cells()
+    assert dialog.model.counts.sum() == 0
+    assert sorted(changed) == [((0, 0), (0, 1)), ((2, 1), (2, 1))]
+    assert dialog.model.data(dialog.model.index(2, 1)) is None
+
+    dialog.undo_stack.undo()
+    assert dialog.model.cell_stats(2, 1) == (1, 4.0, 4.0, 4.0)
+    assert dialog.model.data(dialog.model.index(2, 1)) == "Avg: 4.00 / 1"
+
+
+def test_import_after_clear_cannot_be_undone_away(dialog: SurfaceMappingDialog) -> None:
+    select_cell(dialog, 0, 0)
+    dialog.handle_measurement_import(1.0, 1.0, 1.0, 1)
+    dialog.clear_selected_cells()
+    assert dialog.undo_stack.canUndo()
+
+    dialog.handle_measurement_import(3.0, 3.0, 3.0, 2)
+
+    assert not dialog.undo_stack.canUndo()
+    dialog.undo_stack.undo()
+    assert dialog.model.cell_stats(0, 0) == (2, 3.0, 3.0, 3.0)
+
+
+def test_save_measurement_keeps_running_average(dialog: SurfaceMappingDialog, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(QMessageBox, "information", lambda *args: None)
+    select_cell(dialog, 0, 0)
+    dialog.handle_measurement_import(4.0, 4.0, 4.0, 1)
+
+    dialog.save_measurement()
+
+    assert dialog.model.cell_stats(0, 0)[:2] == (2, 7.0)
+    dialog.sync_rows()
+    assert Path(dialog.file_path).read_text().splitlines()[-1] == "A1,2,7.0,4.0,10.0"
+
+
+def test_reload_restores_written_rows(dialog: SurfaceMappingDialog, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(QMessageBox, "information", lambda *args: None)
+    select_cell(dialog, 0, 0)
+    dialog.handle_measurement_import(-0.4, -0.9, 0.2, 5)
+    select_cell(dialog, 1, 1)
+    dialog.handle_measurement_import(2.5, 2.0, 3.0, 3)
+    dialog.handle_measurement_import(2.5, 1.5, 3.5, 6)
+    select_cell(dialog, 2, 0)
+    dialog.save_measurement()
+    dialog.sync_rows()
+    with open(dialog.file_path, "a", encoding="utf-8") as plate_file:
+        plate_file.write("B1,x,1.0,0.0,2.0\n")  # damaged rows are skipped
+
+    expected = [dialog.model.cell_stats(row, col) for row in range(3) for col in range(2)]
+    dialog.model.clear()
+    dialog.load_existing_measurements()
+
+    assert [dialog.model.cell_stats(row, col) for row in range(3) for col in range(2)] == expected
+    assert dialog.model.cell_stats(0, 0) == (5, -0.4, -0.9, 0.2)
+    assert dialog.model.data(dialog.model.index(1, 1)) == "Avg: 2.50 / 9"
+
+
+def test_load_without_plate_file_keeps_cells_empty(dialog: SurfaceMappingDialog) -> None:
+    dialog.load_existing_measurements()
+
+    assert dialog.model.counts.sum() == 0
+
+
+def test_import_button_runs_one_import(qtbot: Any, dialog: SurfaceMappingDialog) -> None:
+    class FakeMainWindow:
+        calls = 0
+
+        def compute_overall_measurement(self) -> tuple[float, float, float, int]:
+            self.calls += 1
+            return 2.0, 1.0, 3.0, 4
+
+    dialog.main_window = FakeMainWindow()
+    select_cell(dialog, 0, 0)
+
+    qtbot.mouseClick(dialog.import_measurement_button, Qt.LeftButton)
+
+    assert dialog.main_window.calls == 1
+    assert dialog.model.cell_stats(0, 0) == (4, 2.0, 1.0, 3.0)
+
+
+def test_put_cells_drops_only_changed_cells_from_cache(dialog: SurfaceMappingDialog) -> None:
+    model = dialog.model
+    model.data(model.index(0, 0))
+    model.data(model.index(2, 1))
+
+    model.put_cells([(0, 0, 1, 1)], (1, 2.0, 2.0, 2.0))
+
+    assert list(model.render_cache) == [(2, 1)]
+    assert model.data(model.index(1, 1)) == "Avg: 2.00 / 1"
+
+
+def test_import_goes_to_first_cell_of_range(dialog: SurfaceMappingDialog, monkeypatch: pytest.MonkeyPatch) -> None:
+    warnings = []
+    monkeypatch.setattr(QMessageBox, "warning", lambda *args: warnings.append(args[1]))
+    selection = QItemSelection(dialog.model.index(1, 0), dialog.model.index(2, 1))
+    dialog.table.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+
+    dialog.handle_measurement_import(2.0, 2.0, 2.0, 1)
+    dialog.save_measurement()
+
+    assert dialog.model.cell_stats(1, 0) == (1, 2.0, 2.0, 2.0)
+    assert warnings == ["Multiple Selection"]
+
+
+def test_empty_cells_are_red(dialog: SurfaceMappingDialog) -> None:
+    index = dialog.model.index(0, 0)
+    assert dialog.model.data(index) is None
+    assert dialog.model.data(index, Qt.BackgroundRole) == QColor("red")
+
+
+def test_column_width_fits_sample_text(dialog: SurfaceMappingDialog) -> None:
+    header = dialog.table.horizontalHeader()
+    text_width = dialog.table.fontMetrics().horizontalAdvance(dialog.table.SAMPLE_TEXT)
+
+    assert header.sectionSize(0) > text_width
@@ -2,7 +2,13 @@ from __future__ import annotations
 
 from typing import Any
 
+import matplotlib.pyplot as plt
+
+from src.DataClasses import Sample
+from src.Widgets import Graph
 from src.Widgets import PixmapWidget
+from src.Widgets import smooth_grid
+from src.Widgets import TableUnit
 
 
 def test_PixmapWidget(qtbot: Any) -> None:
@@ -12,3 +18,98 @@ def test_PixmapWidget(qtbot: Any) -> None:
     pixmap.show()
 
     assert pixmap.isVisible()
+
+
+def test_TableUnit_display_follows_changes(qtbot: Any) -> None:
+    cell = TableUnit()
+    cell.value = 1.0
+    cell.units = "mm"
+    assert cell.text() == "1.00mm"
+
+    cell.units = "μm"
+    assert cell.text() == "1000.00μm"
+
+    cell.value = 0.002
+    assert cell.text() == "2.00μm"
+
+
+def test_Graph_skips_redraw_when_plot_unchanged(qtbot: Any, monkeypatch: Any) -> None:
+    samples = [Sample(1, 0.1), Sample(2, 0.3), Sample(3, 0.2)]
+    graph = Graph(samples)
+    qtbot.addWidget(graph)
+
+    draws = []
+    monkeypatch.setattr(graph.canvas, "draw_idle", lambda: draws.append(1))
+
+    graph.set_units("mm")
+    graph.set_mode("Raw")
+    graph.update_graph()
+    assert len(draws) == 2
+
+    samples[1].y = 0.4
+    graph.update_graph()
+    assert len(draws) == 3
+
+    # Flattened mode ignores the raw value
+    graph.set_mode("Flattened")
+    samples[1].y = 0.5
+    graph.update_graph()
+    assert len(draws) == 4
+
+
+def test_Graph_reuses_its_lines(qtbot: Any) -> None:
+    samples = [Sample(1, 0.1), Sample(2, 0.3)]
+    graph = Graph(samples)
+    qtbot.addWidget(graph)
+    lines = list(graph.ax.lines)
+
+    graph.set_units("μm")
+    graph.set_mode("Raw")
+    samples.append(Sample(3, 0.2))
+    graph.update_graph()
+
+    assert list(graph.ax.lines) == lines
+    assert graph.ax.get_legend() is graph.legend
+    assert [text.get_text() for text in graph.legend.get_texts()] == ["Samples", "Smooth", "Slope"]
+    assert list(graph.samples_line.get_ydata()) == [100.0, 300.0, 200.0]
+    assert len(graph.smooth_line.get_xdata()) == 500
+    assert list(graph.selected_line.get_xdata()) == [0, 0]
+
+
+def test_Graph_lists_smooth_only_while_drawn(qtbot: Any) -> None:
+    samples = [Sample(1, 0.1), Sample(2, 0.3)]
+    graph = Graph(samples)
+    qtbot.addWidget(graph)
+
+    def legend_texts() -> list[str]:
+        return [text.get_text() for text in graph.ax.get_legend().get_texts()]
+
+    graph.set_units("mm")
+    graph.set_mode("Raw")
+    assert legend_texts() == ["Samples", "Slope"]
+
+    samples.append(Sample(3, 0.2))
+    graph.update_graph()
+    assert legend_texts() == ["Samples", "Smooth", "Slope"]
+
+    del samples[2:]
+    graph.update_graph()
+    assert legend_texts() == ["Samples", "Slope"]
+
+
+def test_smooth_grid_is_shared_per_sample_count() -> None:
+    grid = smooth_grid(4)
+
+    assert smooth_grid(4) is grid
+    assert grid[0] == 1 and grid[-1] == 4 and len(grid) == 500
+    assert not grid.flags.writeable
+
+
+def test_Graph_figure_is_not_registered_with_pyplot(qtbot: Any) -> None:
+    open_figures = plt.get_fignums()
+
+    graph = Graph([Sample(1, 0.1)])
+    qtbot.addWidget(graph)
+
+    assert plt.get_fignums() == open_figures
+    assert graph.ax.figure is graph.canvas.figure
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from PySide6.QtCore import QThreadPool
+
+from src.Workers import CsvWriter
+
+
+def test_CsvWriter(qtbot: Any, tmp_path: Path) -> None:
+    file_path = tmp_path / "export.csv"
+    writer = CsvWriter(str(file_path), [["1.00um", "2.00um"], ["3.00um", ""]])
+
+    with qtbot.waitSignal(writer.signals.OnFinished, timeout=5000) as blocker:
+        QThreadPool.globalInstance().start(writer)
+
+    assert blocker.args == [str(file_path)]
+    assert file_path.read_bytes() == b"1.00um,2.00um\r\n3.00um,\r\n"